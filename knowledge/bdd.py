@@ -0,0 +1,218 @@
+"""
+Knowledge compilation to reduced ordered binary decision diagrams
+"""
+
+import math
+
+from logic import Symbol, Not, And, Or, Implication, Biconditional
+
+# Node numbers of the two terminals
+FALSE = 0
+TRUE = 1
+
+# Boolean functions that apply combines diagrams with
+OPERATIONS = {
+    "and": lambda a, b: a and b,
+    "or": lambda a, b: a or b,
+    "xor": lambda a, b: a != b,
+    "implies": lambda a, b: (not a) or b,
+    "iff": lambda a, b: a == b
+}
+
+
+def order(sentences, heuristic="appearance"):
+    """
+    Returns the symbol names of sentences in an order for a BDD.
+
+    "appearance" orders names by first appearance in a depth-first walk,
+    which keeps symbols that occur together close together. "frequency"
+    puts the most often occurring names first.
+    """
+    names = []
+    counts = dict()
+    stack = list(reversed(sentences))
+    while stack:
+        sentence = stack.pop()
+        if isinstance(sentence, Symbol):
+            if sentence.name not in counts:
+                names.append(sentence.name)
+            counts[sentence.name] = counts.get(sentence.name, 0) + 1
+        else:
+            stack.extend(reversed(sentence.arguments()))
+    if heuristic == "appearance":
+        return names
+    elif heuristic == "frequency":
+        return sorted(names, key=lambda name: -counts[name])
+    raise Exception(f"unknown heuristic {heuristic}")
+
+
+class BDD():
+    """
+    A store of reduced ordered binary decision diagrams over one order of
+    symbol names, each diagram named by the number of its root node.
+
+    Node n tests names[level] and goes to low if it is false and high if
+    it is true. The unique table keeps one node per (level, low, high),
+    so equivalent diagrams are the same number, and results of apply are
+    cached. Names not in the order yet are added to its end when met.
+    """
+
+    def __init__(self, names=()):
+        self.names = []
+        self.levels = dict()
+        self.nodes = [(math.inf, None, None), (math.inf, None, None)]
+        self.unique = dict()
+        self.cache = dict()
+        for name in names:
+            self.level(name)
+
+    def level(self, name):
+        """Returns the level of a symbol name, adding it if new."""
+        if name not in self.levels:
+            self.levels[name] = len(self.names)
+            self.names.append(name)
+        return self.levels[name]
+
+    def node(self, level, low, high):
+        """Returns the node testing level, making it only if needed."""
+        if low == high:
+            return low
+        key = (level, low, high)
+        if key not in self.unique:
+            self.unique[key] = len(self.nodes)
+            self.nodes.append(key)
+        return self.unique[key]
+
+    def variable(self, name):
+        return self.node(self.level(name), FALSE, TRUE)
+
+    def cofactors(self, u, level):
+        """Returns u with the symbol at level false, then true."""
+        nodeLevel, low, high = self.nodes[u]
+        if nodeLevel == level:
+            return low, high
+        return u, u
+
+    def apply(self, operation, u, v):
+        """Returns the diagram of operation applied to diagrams u and v."""
+        if u <= TRUE and v <= TRUE:
+            return TRUE if OPERATIONS[operation](u, v) else FALSE
+        if operation == "and" and FALSE in (u, v):
+            return FALSE
+        if operation == "or" and TRUE in (u, v):
+            return TRUE
+        key = (operation, u, v)
+        if key not in self.cache:
+            level = min(self.nodes[u][0], self.nodes[v][0])
+            u0, u1 = self.cofactors(u, level)
+            v0, v1 = self.cofactors(v, level)
+            self.cache[key] = self.node(
+                level,
+                self.apply(operation, u0, v0),
+                self.apply(operation, u1, v1)
+            )
+        return self.cache[key]
+
+    def negate(self, u):
+        return self.apply("xor", u, TRUE)
+
+    def compile(self, sentence):
+        """Returns the diagram of a logical sentence."""
+        if isinstance(sentence, Symbol):
+            return self.variable(sentence.name)
+        elif isinstance(sentence, Not):
+            return self.negate(self.compile(sentence.operand))
+        elif isinstance(sentence, And):
+            result = TRUE
+            for conjunct in sentence.conjuncts:
+                result = self.apply("and", result, self.compile(conjunct))
+            return result
+        elif isinstance(sentence, Or):
+            result = FALSE
+            for disjunct in sentence.disjuncts:
+                result = self.apply("or", result, self.compile(disjunct))
+            return result
+        elif isinstance(sentence, Implication):
+            return self.apply(
+                "implies",
+                self.compile(sentence.antecedent),
+                self.compile(sentence.consequent)
+            )
+        elif isinstance(sentence, Biconditional):
+            return self.apply(
+                "iff",
+                self.compile(sentence.left),
+                self.compile(sentence.right)
+            )
+        raise Exception(f"cannot compile {sentence}")
+
+    def entails(self, u, v):
+        """Checks if every model of diagram u is a model of diagram v."""
+        return self.apply("implies", u, v) == TRUE
+
+    def restrict(self, u, assignment):
+        """
+        Returns diagram u conditioned on an assignment, a dict mapping
+        symbol names to truth values.
+        """
+        values = {
+            self.levels[name]: value for name, value in assignment.items()
+            if name in self.levels
+        }
+        restricted = dict()
+
+        def walk(u):
+            if u <= TRUE:
+                return u
+            if u not in restricted:
+                level, low, high = self.nodes[u]
+                if level in values:
+                    restricted[u] = walk(high if values[level] else low)
+                else:
+                    restricted[u] = self.node(level, walk(low), walk(high))
+            return restricted[u]
+
+        return walk(u)
+
+    def count(self, u):
+        """
+        Returns the number of models of diagram u over every name in the
+        order.
+        """
+        counts = {FALSE: 0, TRUE: 1}
+
+        def depth(u):
+            return min(self.nodes[u][0], len(self.names))
+
+        def walk(u):
+            if u not in counts:
+                level, low, high = self.nodes[u]
+                counts[u] = (
+                    walk(low) * 2 ** (depth(low) - level - 1) +
+                    walk(high) * 2 ** (depth(high) - level - 1)
+                )
+            return counts[u]
+
+        return walk(u) * 2 ** depth(u)
+
+
+def entails(knowledge, query):
+    """Checks if knowledge base entails query by comparing diagrams."""
+    bdd = BDD(order([knowledge, query]))
+    return bdd.entails(bdd.compile(knowledge), bdd.compile(query))
+
+
+def backbone(knowledge, queries):
+    """Answers every query against knowledge compiled once."""
+    bdd = BDD(order([knowledge, *queries]))
+    root = bdd.compile(knowledge)
+    answers = dict()
+    for query in queries:
+        u = bdd.compile(query)
+        if bdd.entails(root, u):
+            answers[query] = True
+        elif bdd.apply("and", root, u) == FALSE:
+            answers[query] = False
+        else:
+            answers[query] = None
+    return answers
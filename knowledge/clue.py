@@ -21,10 +21,11 @@ symbols = characters + rooms + weapons
 
 
 def check_knowledge(knowledge):
+    answers = backbone(knowledge, symbols)
     for symbol in symbols:
-        if model_check(knowledge, symbol):
+        if answers[symbol]:
             termcolor.cprint(f"{symbol}: YES", "green")
-        elif not model_check(knowledge, Not(symbol)):
+        elif answers[symbol] is None:
             print(f"{symbol}: MAYBE")
 
 
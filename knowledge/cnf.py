@@ -0,0 +1,97 @@
+from logic import (
+    Sentence, Symbol, Not, And, Or, Implication, Biconditional
+)
+
+
+class CNF():
+    """
+    Clauses in conjunctive normal form, built from logical sentences.
+
+    Variables are positive integers and a literal is a variable or its
+    negation. Each symbol gets its own variable. Compound sentences are
+    Tseitin encoded: they get a fresh variable defined to be equivalent
+    to them, so the clause count grows linearly with sentence size.
+    """
+
+    def __init__(self):
+        self.clauses = []
+        self.variables = dict()
+        self.names = dict()
+        self.count = 0
+
+        # Literal defined for each compound sentence encoded so far, keyed
+        # by id and holding the sentence so the id stays unique
+        self.definitions = dict()
+
+    def new_variable(self):
+        self.count += 1
+        return self.count
+
+    def variable(self, name):
+        """Returns the variable for a symbol name, creating it if new."""
+        if name not in self.variables:
+            variable = self.new_variable()
+            self.variables[name] = variable
+            self.names[variable] = name
+        return self.variables[name]
+
+    def add(self, sentence):
+        """Adds clauses asserting that sentence is true."""
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or):
+            self.clauses.append(
+                [self.literal(disjunct) for disjunct in sentence.disjuncts]
+            )
+        elif isinstance(sentence, Implication):
+            self.clauses.append([
+                -self.literal(sentence.antecedent),
+                self.literal(sentence.consequent)
+            ])
+        else:
+            self.clauses.append([self.literal(sentence)])
+
+    def literal(self, sentence):
+        """Returns a literal equivalent to sentence."""
+        Sentence.validate(sentence)
+        if isinstance(sentence, Symbol):
+            return self.variable(sentence.name)
+        if isinstance(sentence, Not):
+            return -self.literal(sentence.operand)
+        if id(sentence) in self.definitions:
+            return self.definitions[id(sentence)][1]
+
+        if isinstance(sentence, And):
+            literals = [self.literal(c) for c in sentence.conjuncts]
+            if len(literals) == 1:
+                return literals[0]
+            v = self.new_variable()
+            for literal in literals:
+                self.clauses.append([-v, literal])
+            self.clauses.append([v] + [-literal for literal in literals])
+        elif isinstance(sentence, Or):
+            literals = [self.literal(d) for d in sentence.disjuncts]
+            if len(literals) == 1:
+                return literals[0]
+            v = self.new_variable()
+            for literal in literals:
+                self.clauses.append([v, -literal])
+            self.clauses.append([-v] + literals)
+        elif isinstance(sentence, Implication):
+            a = self.literal(sentence.antecedent)
+            b = self.literal(sentence.consequent)
+            v = self.new_variable()
+            self.clauses.extend([[-v, -a, b], [v, a], [v, -b]])
+        elif isinstance(sentence, Biconditional):
+            a = self.literal(sentence.left)
+            b = self.literal(sentence.right)
+            v = self.new_variable()
+            self.clauses.extend([
+                [-v, -a, b], [-v, a, -b], [v, a, b], [v, -a, -b]
+            ])
+        else:
+            raise Exception(f"cannot encode {sentence}")
+
+        self.definitions[id(sentence)] = (sentence, v)
+        return v
@@ -0,0 +1,39 @@
+"""
+Model checking with sentences compiled to Python functions
+"""
+
+
+def symbol_names(knowledge, queries):
+    return sorted(set.union(
+        knowledge.symbols(), *[query.symbols() for query in queries]
+    ))
+
+
+def entails(knowledge, query):
+    """
+    Checks if knowledge base entails query, running the compiled
+    knowledge over every model as a bitmask and the compiled query over
+    the models of knowledge.
+    """
+    names = symbol_names(knowledge, [query])
+    holds = query.compile(names, bitmask=True)
+    models = filter(knowledge.compile(names, bitmask=True),
+                    range(2 ** len(names)))
+    return all(map(holds, models))
+
+
+def backbone(knowledge, queries):
+    """Answers every query over one pass through the models of knowledge."""
+    names = symbol_names(knowledge, queries)
+    models = list(filter(knowledge.compile(names, bitmask=True),
+                         range(2 ** len(names))))
+    answers = dict()
+    for query in queries:
+        holds = query.compile(names, bitmask=True)
+        if all(map(holds, models)):
+            answers[query] = True
+        elif not any(map(holds, models)):
+            answers[query] = False
+        else:
+            answers[query] = None
+    return answers
@@ -0,0 +1,175 @@
+"""
+Exact model counting with component decomposition and caching
+"""
+
+from cnf import CNF
+from logic import And, Not
+
+
+def condition(clauses, literal):
+    """
+    Returns clauses with literal set true, or None if that falsifies
+    one of them.
+    """
+    result = []
+    for clause in clauses:
+        if literal in clause:
+            continue
+        if -literal in clause:
+            clause = tuple(other for other in clause if other != -literal)
+            if not clause:
+                return None
+        result.append(clause)
+    return result
+
+
+def propagate(clauses):
+    """
+    Sets literals of unit clauses true until none are left. Returns the
+    remaining clauses and the set of variables assigned, or None on a
+    conflict.
+    """
+    assigned = set()
+    while clauses is not None:
+        unit = next((clause for clause in clauses if len(clause) == 1), None)
+        if unit is None:
+            return clauses, assigned
+        assigned.add(abs(unit[0]))
+        clauses = condition(clauses, unit[0])
+    return None
+
+
+def variables(clauses):
+    return {abs(literal) for clause in clauses for literal in clause}
+
+
+def components(clauses):
+    """Splits clauses into groups that share no variables."""
+    parents = dict()
+
+    def find(v):
+        while parents.setdefault(v, v) != v:
+            parents[v] = parents[parents[v]]
+            v = parents[v]
+        return v
+
+    for clause in clauses:
+        for literal in clause[1:]:
+            parents[find(abs(literal))] = find(abs(clause[0]))
+    groups = dict()
+    for clause in clauses:
+        groups.setdefault(find(abs(clause[0])), []).append(clause)
+    return [frozenset(group) for group in groups.values()]
+
+
+class Counter():
+    """
+    Counts the models of clauses by branching on one variable at a time.
+
+    After unit propagation, clauses that share no variables are counted
+    separately and their counts multiplied. Counts of components are
+    cached, so a component reached again under other assignments, or in
+    a later count with the same counter, is not counted twice.
+    """
+
+    def __init__(self):
+        self.cache = dict()
+        self.hits = 0
+        self.decisions = 0
+
+    def count(self, clauses, count):
+        """
+        Returns the number of assignments to variables 1 to count that
+        satisfy clauses, a list of lists of int literals.
+        """
+        clauses = [
+            tuple(sorted(set(clause))) for clause in clauses
+            if not any(-literal in clause for literal in clause)
+        ]
+        if not all(clauses):
+            return 0
+        result = propagate(clauses)
+        if result is None:
+            return 0
+        clauses, assigned = result
+        free = count - len(assigned) - len(variables(clauses))
+        return 2 ** free * self.product(clauses)
+
+    def product(self, clauses):
+        """Returns the product of the counts of the clauses' components."""
+        total = 1
+        for component in components(clauses):
+            total *= self.count_component(component)
+            if total == 0:
+                break
+        return total
+
+    def count_component(self, component):
+        """
+        Returns the number of assignments to the variables of a component
+        that satisfy it.
+        """
+        if component in self.cache:
+            self.hits += 1
+            return self.cache[component]
+
+        # Branch on the variable in the most clauses
+        occurrences = dict()
+        for clause in component:
+            for literal in clause:
+                v = abs(literal)
+                occurrences[v] = occurrences.get(v, 0) + 1
+        v = max(occurrences, key=occurrences.get)
+        self.decisions += 1
+
+        total = 0
+        for literal in (v, -v):
+            result = propagate(condition(component, literal))
+            if result is None:
+                continue
+            clauses, assigned = result
+            free = (len(occurrences) - 1 - len(assigned)
+                    - len(variables(clauses)))
+            total += 2 ** free * self.product(clauses)
+        self.cache[component] = total
+        return total
+
+
+def count(sentence, names=None):
+    """
+    Returns the number of models of a sentence over names, by default
+    its own symbols. names must include every symbol of the sentence.
+    """
+    symbols = sentence.symbols()
+    names = symbols if names is None else set(names)
+    if not symbols <= names:
+        raise Exception("names must include every symbol")
+    cnf = CNF()
+    cnf.add(sentence)
+    return Counter().count(cnf.clauses, cnf.count) * 2 ** (
+        len(names) - len(symbols)
+    )
+
+
+def counts(knowledge, queries):
+    """
+    Returns a dict mapping each query to the number of models of
+    knowledge in which it is true, over the symbols of knowledge and
+    every query, from one counter whose cache is shared between queries.
+    """
+    cnf = CNF()
+    cnf.add(knowledge)
+    literals = {query: cnf.literal(query) for query in queries}
+    counter = Counter()
+    return {
+        query: counter.count(cnf.clauses + [[literal]], cnf.count)
+        for query, literal in literals.items()
+    }
+
+
+def entails(knowledge, query):
+    """
+    Checks if knowledge base entails query, by counting no models of
+    knowledge ∧ ¬query.
+    """
+    return count(And(knowledge, Not(query))) == 0
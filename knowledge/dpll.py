@@ -0,0 +1,324 @@
+from cnf import CNF
+from logic import Not
+
+
+class Solver():
+    """
+    Conflict-driven clause learning satisfiability solver over integer
+    literal clauses.
+
+    Unit propagation uses two watched literals per clause. When nothing
+    propagates, a pure literal among open clauses is decided if there is
+    one, and otherwise the literal scoring highest on Jeroslow-Wang
+    (shorter open clauses count more). Each conflict is analyzed back to
+    its first unique implication point, the clause learned from it is
+    kept, and the search jumps back to the level where that clause
+    becomes unit. Learned clauses follow from the others, so they stay
+    valid across later calls to solve and add_clause.
+    """
+
+    def __init__(self, clauses=()):
+        self.clauses = []
+        self.units = []
+        self.empty = False
+        self.values = [None]
+        self.levels = [0]
+        self.reasons = [None]
+        self.watches = dict()
+        self.trail = []
+        self.head = 0
+
+        # Trail length when each decision level began
+        self.limits = []
+
+        self.decisions = 0
+        self.propagations = 0
+        self.learned = 0
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def reserve(self, variable):
+        """Makes room in the assignment for variables up to variable."""
+        while len(self.values) <= variable:
+            self.values.append(None)
+            self.levels.append(0)
+            self.reasons.append(None)
+
+    def add_clause(self, clause):
+        """Adds a clause, given as an iterable of nonzero int literals."""
+        clause = list(dict.fromkeys(clause))
+        if any(-literal in clause for literal in clause):
+            return
+        for literal in clause:
+            self.reserve(abs(literal))
+        if not clause:
+            self.empty = True
+        elif len(clause) == 1:
+            self.units.append(clause[0])
+        else:
+            self.watch(clause)
+
+    def watch(self, clause):
+        """Stores a clause of two or more literals, watching the first two."""
+        index = len(self.clauses)
+        self.clauses.append(clause)
+        self.watches.setdefault(clause[0], []).append(index)
+        self.watches.setdefault(clause[1], []).append(index)
+        return index
+
+    def value(self, literal):
+        value = self.values[abs(literal)]
+        if value is None or literal > 0:
+            return value
+        return not value
+
+    def assign(self, literal, reason=None):
+        """Sets literal true at the current level, implied by a clause."""
+        self.values[abs(literal)] = literal > 0
+        self.levels[abs(literal)] = len(self.limits)
+        self.reasons[abs(literal)] = reason
+        self.trail.append(literal)
+
+    def undo(self, size):
+        """Unassigns trail literals until the trail has length size."""
+        while len(self.trail) > size:
+            self.values[abs(self.trail.pop())] = None
+        self.head = min(self.head, size)
+
+    def backjump(self, level):
+        """Undoes every decision level above level."""
+        if level < len(self.limits):
+            self.undo(self.limits[level])
+            del self.limits[level:]
+
+    def decide(self, literal):
+        self.limits.append(len(self.trail))
+        if literal is not None:
+            self.assign(literal)
+
+    def propagate(self):
+        """
+        Assigns literals forced by unit clauses.
+        Returns False on a conflict, leaving the index of the falsified
+        clause in conflict, and True otherwise.
+        """
+        while self.head < len(self.trail):
+            false = -self.trail[self.head]
+            self.head += 1
+            watchers = self.watches.get(false, [])
+            kept = []
+            for n, index in enumerate(watchers):
+                clause = self.clauses[index]
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], clause[0]
+
+                # Satisfied by the other watch
+                if self.value(clause[0]) is True:
+                    kept.append(index)
+                    continue
+
+                # Move the watch to another literal that is not false
+                for k in range(2, len(clause)):
+                    if self.value(clause[k]) is not False:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches.setdefault(clause[1], []).append(index)
+                        break
+                else:
+                    kept.append(index)
+                    if self.value(clause[0]) is False:
+                        kept.extend(watchers[n + 1:])
+                        self.watches[false] = kept
+                        self.conflict = index
+                        return False
+                    self.assign(clause[0], index)
+                    self.propagations += 1
+            self.watches[false] = kept
+        return True
+
+    def analyze(self, index):
+        """
+        Resolves the falsified clause with the reasons of literals set at
+        the current level until only one such literal is left.
+
+        Returns the learned clause, with the negation of that literal
+        first and a literal of the highest remaining level second, and
+        the level to jump back to.
+        """
+        level = len(self.limits)
+        seen = set()
+        learned = [None]
+        open_literals = 0
+        position = len(self.trail)
+        literal = None
+        while True:
+            for other in self.clauses[index]:
+                variable = abs(other)
+                if other == literal or variable in seen:
+                    continue
+                if self.levels[variable] == 0:
+                    continue
+                seen.add(variable)
+                if self.levels[variable] == level:
+                    open_literals += 1
+                else:
+                    learned.append(other)
+
+            # Step back along the trail to the latest literal involved
+            position -= 1
+            while abs(self.trail[position]) not in seen:
+                position -= 1
+            literal = self.trail[position]
+            open_literals -= 1
+            if open_literals == 0:
+                break
+            index = self.reasons[abs(literal)]
+        learned[0] = -literal
+
+        if len(learned) == 1:
+            return learned, 0
+        deepest = max(
+            range(1, len(learned)),
+            key=lambda k: self.levels[abs(learned[k])]
+        )
+        learned[1], learned[deepest] = learned[deepest], learned[1]
+        return learned, self.levels[abs(learned[1])]
+
+    def choose(self):
+        """
+        Returns the literal to decide next, or None if every clause is
+        satisfied.
+        """
+        polarity = dict()
+        scores = dict()
+        for clause in self.clauses:
+            open_literals = []
+            for literal in clause:
+                value = self.value(literal)
+                if value is True:
+                    break
+                if value is None:
+                    open_literals.append(literal)
+            else:
+                weight = 2.0 ** -len(open_literals)
+                for literal in open_literals:
+                    sign = 1 if literal > 0 else 2
+                    polarity[abs(literal)] = (
+                        polarity.get(abs(literal), 0) | sign
+                    )
+                    scores[literal] = scores.get(literal, 0) + weight
+        if not scores:
+            return None
+
+        for v, seen in polarity.items():
+            if seen != 3:
+                return v if seen == 1 else -v
+        return max(scores, key=scores.get)
+
+    def solve(self, assumptions=()):
+        """
+        Returns True if the clauses, together with the assumption
+        literals, are satisfiable. The model is then left in model().
+        """
+        self.undo(0)
+        self.limits = []
+        if self.empty:
+            return False
+        for literal in self.units:
+            if self.value(literal) is False:
+                return False
+            if self.value(literal) is None:
+                self.assign(literal)
+
+        # Assumptions are decided first, one level each, and decided again
+        # whenever a jump back undoes them
+        assumptions = list(assumptions)
+        for literal in assumptions:
+            self.reserve(abs(literal))
+        while True:
+            if not self.propagate():
+                if not self.limits:
+                    return False
+                learned, level = self.analyze(self.conflict)
+                self.learned += 1
+                self.backjump(level)
+                if len(learned) == 1:
+                    self.units.append(learned[0])
+                    self.assign(learned[0])
+                else:
+                    self.assign(learned[0], self.watch(learned))
+                continue
+
+            if len(self.limits) < len(assumptions):
+                literal = assumptions[len(self.limits)]
+                if self.value(literal) is False:
+                    return False
+                self.decide(literal if self.value(literal) is None else None)
+                continue
+
+            literal = self.choose()
+            if literal is None:
+                return True
+            self.decisions += 1
+            self.decide(literal)
+
+    def model(self):
+        """Returns the satisfying assignment as a list of booleans."""
+        return [bool(value) for value in self.values]
+
+
+def entails(knowledge, query):
+    """
+    Checks if knowledge base entails query, by showing that
+    knowledge ∧ ¬query has no model.
+    """
+    cnf = CNF()
+    cnf.add(knowledge)
+    cnf.add(Not(query))
+    return not Solver(cnf.clauses).solve()
+
+
+def backbone(knowledge, queries):
+    """Answers every query against knowledge from one solver."""
+    cnf = CNF()
+    cnf.add(knowledge)
+    literals = {query: cnf.literal(query) for query in queries}
+    solver = Solver(cnf.clauses)
+    solver.reserve(cnf.count)
+    return answer(solver, literals)
+
+
+def answer(solver, literals, assumptions=()):
+    """
+    Answers queries, given as a dict mapping each query to its literal,
+    as backbone does, against the solver's clauses and assumptions.
+    Each query is only tested against the opposite of the value it has
+    in every model found so far.
+    """
+    assumptions = list(assumptions)
+    if not solver.solve(assumptions):
+        return {query: True for query in literals}
+
+    def holds(literal, model):
+        return model[abs(literal)] == (literal > 0)
+
+    model = solver.model()
+    candidates = {
+        query: holds(literal, model) for query, literal in literals.items()
+    }
+    answers = dict()
+    for query, literal in literals.items():
+        if query not in candidates:
+            continue
+        value = candidates.pop(query)
+        if not solver.solve(assumptions + [-literal if value else literal]):
+            answers[query] = value
+            continue
+
+        # The counter-model also rules out other candidates it flips
+        answers[query] = None
+        model = solver.model()
+        for other in list(candidates):
+            if holds(literals[other], model) != candidates[other]:
+                del candidates[other]
+                answers[other] = None
+    return answers
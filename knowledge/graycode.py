@@ -0,0 +1,246 @@
+"""
+Model checking over partial models visited in Gray-code order
+"""
+
+from logic import Symbol, Not, And, Or, Implication, Biconditional
+
+KINDS = [Symbol, Not, And, Or, Implication, Biconditional]
+
+# What a search does after visiting a partial model
+DESCEND, SKIP, STOP = range(3)
+
+
+class Circuit():
+    """
+    Sentences as a circuit with one node per distinct sub-sentence, whose
+    true, false or unknown (None) values are kept up to date under a
+    single mutable partial assignment.
+
+    Nodes are numbered children first. Each symbol has a precomputed
+    list of the nodes depending on it, in that order, so changing the
+    symbol walks the list once and re-evaluates only nodes marked dirty
+    by an input that changed. And and Or nodes count their false and
+    true inputs respectively, and their unknown inputs, so each changed
+    input updates them in constant time.
+    """
+
+    def __init__(self, sentences):
+        self.kinds = []
+        self.children = []
+        self.parents = []
+        self.numbers = dict()
+        self.symbols = dict()
+        for sentence in sentences:
+            self.add(sentence)
+
+        # Start with every symbol unknown. Children come first, so their
+        # values are known when counted, including constants like And()
+        size = len(self.kinds)
+        self.values = [None] * size
+        self.counts = [0] * size
+        self.unknowns = [0] * size
+        self.dirty = [False] * size
+        for n, kind in enumerate(self.kinds):
+            if kind is And or kind is Or:
+                target = kind is Or
+                values = [self.values[child] for child in self.children[n]]
+                self.counts[n] = sum(value is target for value in values)
+                self.unknowns[n] = sum(value is None for value in values)
+            self.values[n] = self.compute(n)
+
+        # Nodes above each symbol, children first
+        self.dependents = dict()
+        for name, n in self.symbols.items():
+            above = set()
+            stack = [n]
+            while stack:
+                for parent in self.parents[stack.pop()]:
+                    if parent not in above:
+                        above.add(parent)
+                        stack.append(parent)
+            self.dependents[n] = sorted(above)
+
+    def number(self, sentence):
+        """Returns the node number of a sentence added to the circuit."""
+        return self.numbers[id(sentence)]
+
+    def add(self, sentence):
+        """
+        Adds nodes for sentence and every sub-sentence not yet added.
+        Symbols are interned, so sentences are told apart by identity.
+        """
+        stack = [(sentence, False)]
+        while stack:
+            sentence, expanded = stack.pop()
+            key = id(sentence)
+            if key in self.numbers:
+                continue
+            kind = type(sentence)
+            if kind not in KINDS:
+                kind = next(
+                    (kind for kind in KINDS if isinstance(sentence, kind)),
+                    None
+                )
+                if kind is None:
+                    raise Exception(f"cannot evaluate {sentence}")
+            children = () if kind is Symbol else sentence.arguments()
+            if children and not expanded:
+                stack.append((sentence, True))
+                stack.extend((child, False) for child in children)
+                continue
+
+            n = len(self.kinds)
+            self.numbers[key] = n
+            self.kinds.append(kind)
+            self.children.append([self.number(child) for child in children])
+            self.parents.append([])
+            for child in self.children[n]:
+                self.parents[child].append(n)
+            if kind is Symbol:
+                self.symbols[sentence.name] = n
+
+    def compute(self, n):
+        """Returns the value of node n from its inputs."""
+        kind = self.kinds[n]
+        if kind is And:
+            if self.counts[n]:
+                return False
+            return None if self.unknowns[n] else True
+        elif kind is Or:
+            if self.counts[n]:
+                return True
+            return None if self.unknowns[n] else False
+        elif kind is Symbol:
+            return self.values[n]
+
+        children = self.children[n]
+        a = self.values[children[0]]
+        if kind is Not:
+            return None if a is None else not a
+        b = self.values[children[1]]
+        if kind is Implication:
+            if a is False or b is True:
+                return True
+            return None if a is None or b is None else False
+        return None if a is None or b is None else a == b
+
+    def changed(self, n, old):
+        """Passes a change in node n's value from old on to its parents."""
+        new = self.values[n]
+        for parent in self.parents[n]:
+            kind = self.kinds[parent]
+            if kind is And or kind is Or:
+                target = kind is Or
+                self.counts[parent] += (new is target) - (old is target)
+                self.unknowns[parent] += (new is None) - (old is None)
+            self.dirty[parent] = True
+
+    def set(self, name, value):
+        """Sets a symbol to True, False or None and updates the circuit."""
+        n = self.symbols[name]
+        old = self.values[n]
+        self.values[n] = value
+        self.changed(n, old)
+        for n in self.dependents[n]:
+            if not self.dirty[n]:
+                continue
+            self.dirty[n] = False
+            old = self.values[n]
+            value = self.compute(n)
+            if value is not old:
+                self.values[n] = value
+                self.changed(n, old)
+
+    def search(self, names, visit):
+        """
+        Assigns names depth first, calling visit after every change to
+        one symbol. visit returns DESCEND to assign the next name, SKIP to
+        leave every extension of the current partial model unvisited, or
+        STOP to end the search.
+
+        Each name's two values are tried in reflected Gray-code order:
+        starting from the value it last had, so that the complete models
+        reached follow one another by a single flip.
+        """
+        start = [True] * len(names)
+        depth = 0
+        while True:
+            action = visit()
+            if action == STOP:
+                break
+            if action == DESCEND and depth < len(names):
+                self.set(names[depth], start[depth])
+                depth += 1
+                continue
+
+            # Back up past names whose second value has been tried
+            while depth > 0 and (
+                self.values[self.symbols[names[depth - 1]]] != start[depth - 1]
+            ):
+                depth -= 1
+                start[depth] = not start[depth]
+                self.set(names[depth], None)
+            if depth == 0:
+                break
+            self.set(names[depth - 1], not start[depth - 1])
+
+        # Leave every symbol unknown again
+        for name in names[:depth]:
+            self.set(name, None)
+
+
+def entails(knowledge, query):
+    """
+    Checks if knowledge base entails query, skipping partial models that
+    already make knowledge false or query true.
+    """
+    circuit = Circuit([knowledge, query])
+    k = circuit.number(knowledge)
+    q = circuit.number(query)
+    values = circuit.values
+    entailed = True
+
+    def visit():
+        nonlocal entailed
+        if values[k] is False or values[q] is True:
+            return SKIP
+        if values[k] is True and values[q] is False:
+            entailed = False
+            return STOP
+        return DESCEND
+
+    circuit.search(sorted(circuit.symbols), visit)
+    return entailed
+
+
+def backbone(knowledge, queries):
+    """
+    Answers every query in one search, skipping partial models that make
+    knowledge false and stopping once every query has been both true and
+    false in models of knowledge.
+    """
+    circuit = Circuit([knowledge, *queries])
+    k = circuit.number(knowledge)
+    numbers = {query: circuit.number(query) for query in queries}
+    values = circuit.values
+    seen = {query: set() for query in queries}
+    undecided = set(queries)
+
+    def visit():
+        if values[k] is False:
+            return SKIP
+        if values[k] is None or any(
+            values[numbers[query]] is None for query in undecided
+        ):
+            return DESCEND
+        for query in list(undecided):
+            seen[query].add(values[numbers[query]])
+            if len(seen[query]) == 2:
+                undecided.remove(query)
+        return SKIP if undecided else STOP
+
+    circuit.search(sorted(circuit.symbols), visit)
+    return {
+        query: None if len(outcomes) == 2 else False not in outcomes
+        for query, outcomes in seen.items()
+    }
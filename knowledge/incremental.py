@@ -0,0 +1,101 @@
+"""
+Incremental knowledge base backed by one clause-learning solver
+"""
+
+from cnf import CNF
+from dpll import Solver, answer
+from logic import And
+
+
+class KnowledgeBase():
+    """
+    A knowledge base that keeps its clauses and solver between queries,
+    so facts are encoded once and clauses learned while answering one
+    query speed up the next.
+
+    push opens a scope and pop retracts every sentence added since the
+    matching push. Each scope has a selector variable that is assumed
+    true in every query while the scope is open, and sentences added in
+    it are only asserted when their scope's selector holds. pop makes the
+    selector false for good, so learned clauses, which carry the
+    selectors they depend on, remain valid. Sentences should not be
+    changed after they are added.
+    """
+
+    def __init__(self, *sentences):
+        self.cnf = CNF()
+        self.solver = Solver()
+        self.sentences = []
+        self.scopes = []
+        self.flushed = 0
+        for sentence in sentences:
+            self.add(sentence)
+
+    def flush(self):
+        """Passes clauses the encoding has gained on to the solver."""
+        for clause in self.cnf.clauses[self.flushed:]:
+            self.solver.add_clause(clause)
+        self.flushed = len(self.cnf.clauses)
+        self.solver.reserve(self.cnf.count)
+
+    def add(self, sentence):
+        """Adds a sentence to the knowledge base, in the current scope."""
+        if not self.scopes:
+            self.cnf.add(sentence)
+        else:
+            literal = self.cnf.literal(sentence)
+            self.flush()
+            self.solver.add_clause([-self.scopes[-1][0], literal])
+        self.flush()
+        self.sentences.append(sentence)
+
+    def push(self):
+        """Opens a scope whose sentences are retracted by the next pop."""
+        self.scopes.append((self.cnf.new_variable(), len(self.sentences)))
+
+    def pop(self):
+        """Retracts every sentence added since the last push."""
+        if not self.scopes:
+            raise Exception("no scope to pop")
+        selector, size = self.scopes.pop()
+        self.solver.add_clause([-selector])
+        del self.sentences[size:]
+
+    def knowledge(self):
+        """Returns the sentences currently in force as one sentence."""
+        return And(*self.sentences)
+
+    def literals(self, assumptions):
+        """
+        Returns solver assumptions for the open scopes and for each
+        sentence in assumptions being true.
+        """
+        literals = [selector for selector, _ in self.scopes]
+        literals.extend(self.cnf.literal(sentence) for sentence in assumptions)
+        self.flush()
+        return literals
+
+    def satisfiable(self, assumptions=()):
+        """
+        Checks if the knowledge base, with every sentence in assumptions
+        assumed true, has a model.
+        """
+        return self.solver.solve(self.literals(assumptions))
+
+    def entails(self, query, assumptions=()):
+        """
+        Checks if the knowledge base, with every sentence in assumptions
+        assumed true, entails query.
+        """
+        literals = self.literals(assumptions)
+        literals.append(-self.cnf.literal(query))
+        self.flush()
+        return not self.solver.solve(literals)
+
+    def backbone(self, queries, assumptions=()):
+        """
+        Answers several queries at once, like logic.backbone, under the
+        given assumptions.
+        """
+        literals = {query: self.cnf.literal(query) for query in queries}
+        return answer(self.solver, literals, self.literals(assumptions))
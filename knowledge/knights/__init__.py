@@ -0,0 +1,2 @@
+# Run from knowledge/, e.g. python -m knights.puzzle, so that the shared
+# logic library is importable
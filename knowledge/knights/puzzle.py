@@ -79,8 +79,9 @@ def main():
         if len(knowledge.conjuncts) == 0:
             print("    Not yet implemented.")
         else:
+            answers = backbone(knowledge, symbols)
             for symbol in symbols:
-                if model_check(knowledge, symbol):
+                if answers[symbol]:
                     print(f"    {symbol}")
 
 
@@ -1,12 +1,96 @@
-import itertools
+import functools
+import importlib
+import weakref
+
+
+# Levels of a sentence compiled into one Python expression at most;
+# deeper parts get functions of their own, since Python limits how
+# deeply an expression can nest
+PART_DEPTH = 40
+
+
+class EvaluationException(Exception):
+    """Raised when a sentence cannot be evaluated in a model."""
+
+
+def cached(method):
+    """
+    Caches the result of a sentence method without arguments until the
+    sentence changes. Cached sets are copied so callers may change them.
+    """
+    @functools.wraps(method)
+    def wrapper(self):
+        if method.__name__ not in self.cache:
+            self.cache[method.__name__] = method(self)
+        value = self.cache[method.__name__]
+        return set(value) if isinstance(value, set) else value
+    return wrapper
 
 
 class Sentence():
+    """
+    Base class of logical sentences.
+
+    Sentences other than And are immutable and interned: building one
+    with the same class and the same child objects as a live sentence
+    returns that sentence, so repeated structure is stored once. And can
+    grow with add, so a sentence containing an And, directly or further
+    down, is mutable, and is linked as a parent of its mutable children so
+    that add can clear every cache that depended on the old conjuncts.
+    """
+
+    # Interned sentences, keyed by class and name or child ids; a key's
+    # children stay alive at least as long as its sentence does
+    interned = weakref.WeakValueDictionary()
+
+    @classmethod
+    def intern(cls, key, fields, children):
+        """Returns the interned sentence of class cls for key."""
+        key = (cls, key)
+        sentence = Sentence.interned.get(key)
+        if sentence is None:
+            sentence = object.__new__(cls)
+            sentence.__dict__.update(fields)
+            sentence.link(children, mutable=False)
+            Sentence.interned[key] = sentence
+        return sentence
+
+    def link(self, children, mutable):
+        """Sets up caches and registers with any mutable children."""
+        self.cache = dict()
+        self.mutable = mutable or any(child.mutable for child in children)
+        if self.mutable:
+            self.parents = weakref.WeakSet()
+        for child in children:
+            if child.mutable:
+                child.parents.add(self)
+
+    def invalidate(self):
+        """Clears cached results of this sentence and all containing it."""
+        self.cache.clear()
+        for parent in self.parents:
+            parent.invalidate()
+
+    def arguments(self):
+        """Returns the constructor arguments that build the sentence."""
+        return ()
+
+    def __reduce__(self):
+        # Copies and unpickled sentences go through the constructor, so
+        # they are interned and start with empty caches
+        return (type(self), self.arguments())
 
     def evaluate(self, model):
         """Evaluates the logical sentence."""
         raise Exception("nothing to evaluate")
 
+    def evaluate_partial(self, model):
+        """
+        Evaluates the logical sentence in a model that may leave symbols
+        out. Returns None if the value depends on a missing symbol.
+        """
+        raise Exception("nothing to evaluate")
+
     def formula(self):
         """Returns string formula representing logical sentence."""
         return ""
@@ -15,6 +99,93 @@ class Sentence():
         """Returns a set of all symbols in the logical sentence."""
         return set()
 
+    def expression(self, variables):
+        """
+        Returns a Python expression for the value of the logical sentence,
+        given a dict mapping each symbol to an expression for its value.
+        """
+        raise Exception("nothing to compile")
+
+    @classmethod
+    def part(cls, sentence, variables):
+        """
+        Returns the expression for a part of a sentence: a call if compile
+        gave the part a function of its own, keyed by id in variables.
+        """
+        if id(sentence) in variables:
+            return variables[id(sentence)]
+        return sentence.expression(variables)
+
+    def compile(self, names, bitmask=False):
+        """
+        Returns a function computing the sentence's value in a model, with
+        the same short-circuiting as evaluate but without walking the tree.
+
+        The function takes the values of the symbols in names, in order,
+        as a sequence or, if bitmask is True, as an int whose bit i is the
+        value of names[i]. Functions are cached on the sentence.
+
+        Heights of parts are split into bands of PART_DEPTH levels, and
+        a part in a lower band than a sentence containing it becomes a
+        function of its own, called from that sentence's expression.
+        """
+        names = tuple(names)
+        functions = self.cache.setdefault("functions", dict())
+        if (names, bitmask) not in functions:
+            if bitmask:
+                variables = {
+                    name: f"(m >> {i} & 1)" for i, name in enumerate(names)
+                }
+            else:
+                variables = {name: f"m[{i}]" for i, name in enumerate(names)}
+
+            # Find each part's height, children first
+            heights = dict()
+            stack = [(self, False)]
+            while stack:
+                sentence, expanded = stack.pop()
+                if id(sentence) in heights:
+                    continue
+                children = sentence.arguments()
+                if isinstance(sentence, Symbol):
+                    heights[id(sentence)] = (0, sentence)
+                elif expanded:
+                    heights[id(sentence)] = (1 + max(
+                        [heights[id(child)][0] for child in children],
+                        default=0
+                    ), sentence)
+                else:
+                    stack.append((sentence, True))
+                    stack.extend((child, False) for child in children)
+
+            # Compile the parts needing their own functions, lowest first,
+            # so each function calls those below it
+            parts = dict()
+            for height, sentence in heights.values():
+                for child in sentence.arguments():
+                    if not isinstance(child, Sentence):
+                        continue
+                    childHeight = heights[id(child)][0]
+                    if id(child) not in parts and (
+                        childHeight // PART_DEPTH < height // PART_DEPTH
+                    ):
+                        parts[id(child)] = (childHeight, len(parts), child)
+            source = ""
+            for _, i, sentence in sorted(parts.values()):
+                source += (
+                    f"def part{i}(m):\n"
+                    f"    return {sentence.expression(variables)}\n"
+                )
+                variables[id(sentence)] = f"part{i}(m)"
+            source += (
+                "def sentence(m):\n"
+                f"    return True if {self.expression(variables)} else False\n"
+            )
+            namespace = dict()
+            exec(source, namespace)
+            functions[(names, bitmask)] = namespace["sentence"]
+        return functions[(names, bitmask)]
+
     @classmethod
     def validate(cls, sentence):
         if not isinstance(sentence, Sentence):
@@ -44,64 +215,94 @@ class Sentence():
 
 class Symbol(Sentence):
 
-    def __init__(self, name):
-        self.name = name
+    def __new__(cls, name):
+        return cls.intern(name, {"name": name}, [])
 
     def __eq__(self, other):
         return isinstance(other, Symbol) and self.name == other.name
 
+    @cached
     def __hash__(self):
         return hash(("symbol", self.name))
 
     def __repr__(self):
         return self.name
 
+    def arguments(self):
+        return (self.name,)
+
     def evaluate(self, model):
         try:
             return bool(model[self.name])
         except KeyError:
             raise EvaluationException(f"variable {self.name} not in model")
 
+    def evaluate_partial(self, model):
+        value = model.get(self.name)
+        return None if value is None else bool(value)
+
     def formula(self):
         return self.name
 
+    @cached
     def symbols(self):
         return {self.name}
 
+    def expression(self, variables):
+        try:
+            return variables[self.name]
+        except KeyError:
+            raise Exception(f"variable {self.name} not in names")
+
 
 class Not(Sentence):
-    def __init__(self, operand):
+    def __new__(cls, operand):
         Sentence.validate(operand)
-        self.operand = operand
+        return cls.intern(id(operand), {"operand": operand}, [operand])
 
     def __eq__(self, other):
         return isinstance(other, Not) and self.operand == other.operand
 
+    @cached
     def __hash__(self):
         return hash(("not", hash(self.operand)))
 
     def __repr__(self):
         return f"Not({self.operand})"
 
+    def arguments(self):
+        return (self.operand,)
+
     def evaluate(self, model):
         return not self.operand.evaluate(model)
 
+    def evaluate_partial(self, model):
+        value = self.operand.evaluate_partial(model)
+        return None if value is None else not value
+
+    @cached
     def formula(self):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
+    @cached
     def symbols(self):
         return self.operand.symbols()
 
+    def expression(self, variables):
+        return f"(not {Sentence.part(self.operand, variables)})"
+
 
 class And(Sentence):
     def __init__(self, *conjuncts):
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
         self.conjuncts = list(conjuncts)
+        self.link(conjuncts, mutable=True)
 
     def __eq__(self, other):
         return isinstance(other, And) and self.conjuncts == other.conjuncts
 
+    @cached
     def __hash__(self):
         return hash(
             ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
@@ -113,32 +314,62 @@ class And(Sentence):
         )
         return f"And({conjunctions})"
 
+    def arguments(self):
+        return tuple(self.conjuncts)
+
     def add(self, conjunct):
         Sentence.validate(conjunct)
         self.conjuncts.append(conjunct)
+        if conjunct.mutable:
+            conjunct.parents.add(self)
+        self.invalidate()
 
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
 
+    def evaluate_partial(self, model):
+        result = True
+        for conjunct in self.conjuncts:
+            value = conjunct.evaluate_partial(model)
+            if value is False:
+                return False
+            if value is None:
+                result = None
+        return result
+
+    @cached
     def formula(self):
         if len(self.conjuncts) == 1:
             return self.conjuncts[0].formula()
         return " ∧ ".join([Sentence.parenthesize(conjunct.formula())
                            for conjunct in self.conjuncts])
 
+    @cached
     def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
+        return set().union(*[conjunct.symbols()
+                             for conjunct in self.conjuncts])
+
+    def expression(self, variables):
+        if not self.conjuncts:
+            return "True"
+        return "(" + " and ".join([Sentence.part(conjunct, variables)
+                                   for conjunct in self.conjuncts]) + ")"
 
 
 class Or(Sentence):
-    def __init__(self, *disjuncts):
+    def __new__(cls, *disjuncts):
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
-        self.disjuncts = list(disjuncts)
+        return cls.intern(
+            tuple(id(disjunct) for disjunct in disjuncts),
+            {"disjuncts": tuple(disjuncts)},
+            disjuncts
+        )
 
     def __eq__(self, other):
         return isinstance(other, Or) and self.disjuncts == other.disjuncts
 
+    @cached
     def __hash__(self):
         return hash(
             ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
@@ -148,116 +379,435 @@ class Or(Sentence):
         disjuncts = ", ".join([str(disjunct) for disjunct in self.disjuncts])
         return f"Or({disjuncts})"
 
+    def arguments(self):
+        return self.disjuncts
+
     def evaluate(self, model):
         return any(disjunct.evaluate(model) for disjunct in self.disjuncts)
 
+    def evaluate_partial(self, model):
+        result = False
+        for disjunct in self.disjuncts:
+            value = disjunct.evaluate_partial(model)
+            if value is True:
+                return True
+            if value is None:
+                result = None
+        return result
+
+    @cached
     def formula(self):
         if len(self.disjuncts) == 1:
             return self.disjuncts[0].formula()
         return " ∨  ".join([Sentence.parenthesize(disjunct.formula())
                             for disjunct in self.disjuncts])
 
+    @cached
     def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
+        return set().union(*[disjunct.symbols()
+                             for disjunct in self.disjuncts])
+
+    def expression(self, variables):
+        if not self.disjuncts:
+            return "False"
+        return "(" + " or ".join([Sentence.part(disjunct, variables)
+                                  for disjunct in self.disjuncts]) + ")"
 
 
 class Implication(Sentence):
-    def __init__(self, antecedent, consequent):
+    def __new__(cls, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
-        self.antecedent = antecedent
-        self.consequent = consequent
+        return cls.intern(
+            (id(antecedent), id(consequent)),
+            {"antecedent": antecedent, "consequent": consequent},
+            [antecedent, consequent]
+        )
 
     def __eq__(self, other):
         return (isinstance(other, Implication)
                 and self.antecedent == other.antecedent
                 and self.consequent == other.consequent)
 
+    @cached
     def __hash__(self):
         return hash(("implies", hash(self.antecedent), hash(self.consequent)))
 
     def __repr__(self):
         return f"Implication({self.antecedent}, {self.consequent})"
 
+    def arguments(self):
+        return (self.antecedent, self.consequent)
+
     def evaluate(self, model):
         return ((not self.antecedent.evaluate(model))
                 or self.consequent.evaluate(model))
 
+    def evaluate_partial(self, model):
+        antecedent = self.antecedent.evaluate_partial(model)
+        if antecedent is False:
+            return True
+        consequent = self.consequent.evaluate_partial(model)
+        if consequent is True:
+            return True
+        if antecedent is None or consequent is None:
+            return None
+        return False
+
+    @cached
     def formula(self):
         antecedent = Sentence.parenthesize(self.antecedent.formula())
         consequent = Sentence.parenthesize(self.consequent.formula())
         return f"{antecedent} => {consequent}"
 
+    @cached
     def symbols(self):
         return set.union(self.antecedent.symbols(), self.consequent.symbols())
 
+    def expression(self, variables):
+        antecedent = Sentence.part(self.antecedent, variables)
+        consequent = Sentence.part(self.consequent, variables)
+        return f"(not {antecedent} or {consequent})"
+
 
 class Biconditional(Sentence):
-    def __init__(self, left, right):
+    def __new__(cls, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
-        self.left = left
-        self.right = right
+        return cls.intern(
+            (id(left), id(right)),
+            {"left": left, "right": right},
+            [left, right]
+        )
 
     def __eq__(self, other):
         return (isinstance(other, Biconditional)
                 and self.left == other.left
                 and self.right == other.right)
 
+    @cached
     def __hash__(self):
         return hash(("biconditional", hash(self.left), hash(self.right)))
 
     def __repr__(self):
         return f"Biconditional({self.left}, {self.right})"
 
+    def arguments(self):
+        return (self.left, self.right)
+
     def evaluate(self, model):
         return ((self.left.evaluate(model)
                  and self.right.evaluate(model))
                 or (not self.left.evaluate(model)
                     and not self.right.evaluate(model)))
 
+    def evaluate_partial(self, model):
+        left = self.left.evaluate_partial(model)
+        if left is None:
+            return None
+        right = self.right.evaluate_partial(model)
+        if right is None:
+            return None
+        return left == right
+
+    @cached
     def formula(self):
         left = Sentence.parenthesize(str(self.left))
         right = Sentence.parenthesize(str(self.right))
         return f"{left} <=> {right}"
 
+    @cached
     def symbols(self):
         return set.union(self.left.symbols(), self.right.symbols())
 
-
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
+    def expression(self, variables):
+        left = Sentence.part(self.left, variables)
+        right = Sentence.part(self.right, variables)
+        return f"((not {left}) == (not {right}))"
+
+
+def simplify(sentence):
+    """
+    Returns a sentence equivalent to sentence but simpler to check.
+
+    Negations are pushed inward onto symbols and implications become
+    disjunctions. Nested conjunctions and disjunctions are flattened and
+    their repeated parts dropped, and a symbol appearing alongside its
+    negation folds the whole to a constant. Constants are folded away,
+    with an empty And meaning true and an empty Or meaning false.
+
+    The result is cached on sentence until sentence changes, so repeated
+    checks reuse it and its own caches; it should not be changed. The
+    walk keeps its own stack, so depth is not limited by recursion.
+    """
+    if "simplified" not in sentence.cache:
+        sentence.cache["simplified"] = rewrite_all(sentence)
+    return sentence.cache["simplified"]
+
+
+def rewrite_all(sentence):
+    """Simplifies sentence and every part of it, children first."""
+
+    # Simplified parts by id and polarity, kept with their sentences
+    # so that ids stay unique
+    simplified = dict()
+
+    def rewrite(sentence, negated):
+        """
+        Yields each (part, negated) whose simplified form it needs, and
+        returns sentence simplified, or its negation if negated.
+        """
+        if isinstance(sentence, Symbol):
+            return Not(sentence) if negated else sentence
+        elif isinstance(sentence, Not):
+            return (yield sentence.operand, not negated)
+        elif isinstance(sentence, And):
+            parts = []
+            for conjunct in sentence.conjuncts:
+                parts.append((yield conjunct, negated))
+            return combine(Or if negated else And, parts)
+        elif isinstance(sentence, Or):
+            parts = []
+            for disjunct in sentence.disjuncts:
+                parts.append((yield disjunct, negated))
+            return combine(And if negated else Or, parts)
+        elif isinstance(sentence, Implication):
+            antecedent = yield sentence.antecedent, not negated
+            consequent = yield sentence.consequent, negated
+            if negated:
+                return combine(And, [antecedent, consequent])
+            return combine(Or, [antecedent, consequent])
+        elif isinstance(sentence, Biconditional):
+            left = yield sentence.left, False
+            right = yield sentence.right, negated
+            if constant(left) is not None:
+                if constant(left):
+                    return right
+                return (yield sentence.right, not negated)
+            if constant(right) is not None:
+                if constant(right):
+                    return left
+                return (yield sentence.left, True)
+            if left == right:
+                return And()
+            if complement(left) == right:
+                return Or()
+            return Biconditional(left, right)
+        raise Exception(f"cannot simplify {sentence}")
+
+    def constant(sentence):
+        """Returns True or False for a constant sentence, else None."""
+        if isinstance(sentence, And) and not sentence.conjuncts:
+            return True
+        if isinstance(sentence, Or) and not sentence.disjuncts:
+            return False
+        return None
+
+    def complement(sentence):
+        if isinstance(sentence, Symbol):
+            return Not(sentence)
+        if isinstance(sentence, Not):
+            return sentence.operand
+        return None
+
+    def combine(kind, parts):
+        """Joins simplified parts with And or Or."""
+        absorbing = Or if kind is And else And
+        children = dict()
+        for part in parts:
+            if isinstance(part, absorbing) and constant(part) is not None:
+                return absorbing()
+            if isinstance(part, kind):
+                part = part.conjuncts if kind is And else part.disjuncts
+            else:
+                part = [part]
+            for child in part:
+                if complement(child) in children:
+                    return absorbing()
+                children[child] = True
+        if len(children) == 1:
+            return next(iter(children))
+        return kind(*children)
+
+    # Run rewrites on a stack, each paused until the part it needs is done
+    stack = [(sentence, False, rewrite(sentence, False))]
+    value = None
+    while stack:
+        current, negated, steps = stack[-1]
+        try:
+            part, partNegated = steps.send(value)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+            simplified[(id(current), negated)] = (current, value)
+            continue
+        key = (id(part), partNegated)
+        if key in simplified:
+            value = simplified[key][1]
+        else:
+            stack.append((part, partNegated, rewrite(part, partNegated)))
+            value = None
+    return value
+
+
+# Modules providing entails(knowledge, query) for each model_check engine
+# other than "enumerate". They import this module, so are loaded on use.
+ENGINES = {
+    "bdd": "bdd",
+    "compiled": "compiled",
+    "counting": "counting",
+    "dpll": "dpll",
+    "graycode": "graycode",
+    "parallel": "parallel",
+    "resolution": "resolution",
+    "truthtable": "truthtable"
+}
+
+# Symbols from which engine="enumerate" walks models with the circuit in
+# graycode.py; on fewer, building the circuit costs more than it saves,
+# so models are enumerated recursively instead
+GRAYCODE_SYMBOLS = 14
+
+
+def model_check(knowledge, query, engine="dpll", **options):
+    """
+    Checks if knowledge base entails query.
+
+    Both are simplified first. By default a SAT solver then looks for a
+    model of knowledge ∧ ¬query; pass engine="enumerate" to check every
+    model instead, or any other name in ENGINES. Other keyword arguments
+    are passed on to the engine's entails, e.g. limit and provers for
+    "resolution", which raises an exception if it reaches its limit.
+    """
+    knowledge = simplify(knowledge)
+    query = simplify(query)
+    if engine == "enumerate" and options:
+        raise Exception("enumerate takes no options")
+    if engine == "enumerate":
+        symbols = set.union(knowledge.symbols(), query.symbols())
+        if len(symbols) < GRAYCODE_SYMBOLS:
+            return enumerate_check(knowledge, query)
+        engine = "graycode"
+    if engine not in ENGINES:
+        raise Exception(f"unknown engine {engine}")
+    module = importlib.import_module(ENGINES[engine])
+    return module.entails(knowledge, query, **options)
+
+
+def backbone(knowledge, queries, engine="dpll", **options):
+    """
+    Answers several queries against one knowledge base at once.
+
+    Returns a dict mapping each query (typically a Symbol) to True if
+    knowledge entails it, False if knowledge entails its negation, or
+    None if neither. An unsatisfiable knowledge base entails everything,
+    so every query maps to True. engine and options are as for
+    model_check.
+    """
+    knowledge = simplify(knowledge)
+    if engine == "enumerate" and options:
+        raise Exception("enumerate takes no options")
+    if engine == "enumerate":
+        symbols = set.union(
+            knowledge.symbols(), *[query.symbols() for query in queries]
+        )
+        if len(symbols) < GRAYCODE_SYMBOLS:
+            return enumerate_backbone(knowledge, queries)
+        engine = "graycode"
+    if engine not in ENGINES:
+        raise Exception(f"unknown engine {engine}")
+    module = importlib.import_module(ENGINES[engine])
+    if hasattr(module, "backbone"):
+        return module.backbone(knowledge, queries, **options)
+
+    # Fall back to two entailment checks per query
+    answers = dict()
+    for query in queries:
+        if module.entails(knowledge, query, **options):
+            answers[query] = True
+        elif module.entails(knowledge, Not(query), **options):
+            answers[query] = False
+        else:
+            answers[query] = None
+    return answers
+
+
+def enumerate_backbone(knowledge, queries):
+    """
+    Answers every query in a single enumeration of the models, stopping
+    once every query has been both true and false in models of knowledge.
+    """
+    seen = {query: set() for query in queries}
+    undecided = set(queries)
+
+    def check_all(symbols, model):
+        """Records query values in every model of knowledge extending model."""
+
+        # Skip partial models that already make knowledge false
+        knowledgeValue = knowledge.evaluate_partial(model)
+        if knowledgeValue is False:
+            return
+
+        # Once knowledge and every undecided query are decided, every model
+        # extending this one gives the same values
+        values = {query: query.evaluate_partial(model) for query in undecided}
+        if knowledgeValue is True and None not in values.values():
+            for query, value in values.items():
+                seen[query].add(value)
+                if len(seen[query]) == 2:
+                    undecided.remove(query)
+            return
+
+        # Otherwise assign one of the remaining symbols both ways
+        remaining = symbols.copy()
+        p = remaining.pop()
+        for value in (True, False):
+            model[p] = value
+            check_all(remaining, model)
+            if not undecided:
+                break
+        del model[p]
+
+    check_all(set.union(
+        knowledge.symbols(), *[query.symbols() for query in queries]
+    ), dict())
+    return {
+        query: None if len(outcomes) == 2 else False not in outcomes
+        for query, outcomes in seen.items()
+    }
+
+
+def enumerate_check(knowledge, query):
+    """Checks if knowledge base entails query by enumerating models."""
 
     def check_all(knowledge, query, symbols, model):
         """Checks if knowledge base entails query, given a particular model."""
 
-        # If model has an assignment for each symbol
-        if not symbols:
-
-            # If knowledge base is true in model, then query must also be true
-            if knowledge.evaluate(model):
-                return query.evaluate(model)
+        # Stop as soon as the symbols assigned so far decide every model
+        # extending them: once knowledge is false or the query true, or
+        # with knowledge true and the query false
+        knowledgeValue = knowledge.evaluate_partial(model)
+        if knowledgeValue is False:
             return True
-        else:
-
-            # Choose one of the remaining unused symbols
-            remaining = symbols.copy()
-            p = remaining.pop()
-
-            # Create a model where the symbol is true
-            model_true = model.copy()
-            model_true[p] = True
-
-            # Create a model where the symbol is false
-            model_false = model.copy()
-            model_false[p] = False
-
-            # Ensure entailment holds in both models
-            return (check_all(knowledge, query, remaining, model_true) and
-                    check_all(knowledge, query, remaining, model_false))
+        queryValue = query.evaluate_partial(model)
+        if queryValue is True:
+            return True
+        if knowledgeValue is True and queryValue is False:
+            return False
+
+        # Otherwise some symbol is still unassigned, so try the next one
+        # both ways, in the same model, and remove it again afterwards
+        p = symbols[len(model)]
+        model[p] = True
+        entailed = check_all(knowledge, query, symbols, model)
+        if entailed:
+            model[p] = False
+            entailed = check_all(knowledge, query, symbols, model)
+        del model[p]
+        return entailed
 
     # Get all symbols in both knowledge and query
-    symbols = set.union(knowledge.symbols(), query.symbols())
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
 
     # Check that knowledge entails query
     return check_all(knowledge, query, symbols, dict())
@@ -51,6 +51,7 @@ knowledge.add(And(
     Not(Symbol("yellow3"))
 ))
 
+answers = backbone(knowledge, symbols)
 for symbol in symbols:
-    if model_check(knowledge, symbol):
+    if answers[symbol]:
         print(symbol)
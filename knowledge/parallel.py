@@ -0,0 +1,114 @@
+"""
+Parallel model checking split over leading symbols
+"""
+
+import multiprocessing
+import os
+
+from logic import And, Not
+
+# Blocks of the model space to hand out per worker, so that workers
+# finishing early can take more
+BLOCKS_PER_WORKER = 8
+
+# How many models a worker checks between looks at the stop flag
+CHUNK = 4096
+
+# Per worker process: the sentences being checked, their symbol names,
+# and the flag raised once any worker finds a counter-model
+sentences = None
+names = None
+found = None
+
+
+def init_worker(workerSentences, workerNames, flag):
+    global sentences, names, found
+    sentences = workerSentences
+    names = workerNames
+    found = flag
+
+
+def block(prefix, bits):
+    """
+    Returns the models, as bitmasks, in which the top bits symbols take
+    the values in prefix.
+    """
+    shift = len(names) - bits
+    return range(prefix << shift, (prefix + 1) << shift)
+
+
+def find_model(task):
+    """
+    Returns True if the first sentence has a model in the block, False if
+    not, or None if another worker found one first.
+    """
+    prefix, bits = task
+    test = sentences[0].compile(names, bitmask=True)
+    models = block(prefix, bits)
+    for start in range(models.start, models.stop, CHUNK):
+        if found.value:
+            return None
+        if any(map(test, range(start, min(start + CHUNK, models.stop)))):
+            found.value = True
+            return True
+    return False
+
+
+def collect(task):
+    """
+    Returns, for each query, 1 if it is true in some model of knowledge in
+    the block, plus 2 if it is false in some such model.
+    """
+    prefix, bits = task
+    knowledge, *queries = [
+        sentence.compile(names, bitmask=True) for sentence in sentences
+    ]
+    seen = [0] * len(queries)
+    for model in filter(knowledge, block(prefix, bits)):
+        for i, query in enumerate(queries):
+            seen[i] |= 1 if query(model) else 2
+        if all(outcomes == 3 for outcomes in seen):
+            break
+    return seen
+
+
+def run(function, workerSentences, workers):
+    """
+    Maps function over every block of the models of workerSentences on a
+    pool of worker processes, yielding results as they finish.
+    """
+    workers = workers or os.cpu_count()
+    workerNames = sorted(set.union(
+        *[sentence.symbols() for sentence in workerSentences]
+    ))
+    blocks = workers * BLOCKS_PER_WORKER
+    bits = min(len(workerNames), (blocks - 1).bit_length())
+    flag = multiprocessing.RawValue("b", False)
+    with multiprocessing.Pool(
+        workers, initializer=init_worker,
+        initargs=(workerSentences, workerNames, flag)
+    ) as pool:
+        tasks = [(prefix, bits) for prefix in range(2 ** bits)]
+        yield from pool.imap_unordered(function, tasks)
+
+
+def entails(knowledge, query, workers=None):
+    """
+    Checks if knowledge base entails query by searching every model of
+    knowledge ∧ ¬query in parallel, stopping all workers at the first.
+    """
+    for result in run(find_model, [And(knowledge, Not(query))], workers):
+        if result:
+            return False
+    return True
+
+
+def backbone(knowledge, queries, workers=None):
+    """Answers every query from one parallel pass through the models."""
+    seen = [0] * len(queries)
+    for outcomes in run(collect, [knowledge, *queries], workers):
+        seen = [a | b for a, b in zip(seen, outcomes)]
+    return {
+        query: None if outcomes == 3 else outcomes != 2
+        for query, outcomes in zip(queries, seen)
+    }
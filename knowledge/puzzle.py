@@ -50,6 +50,7 @@ knowledge.add(
     Symbol("MinervaGryffindor")
 )
 
+answers = backbone(knowledge, symbols)
 for symbol in symbols:
-    if model_check(knowledge, symbol):
+    if answers[symbol]:
         print(symbol)
@@ -0,0 +1,224 @@
+"""
+Resolution refutation with a set of support and subsumption
+"""
+
+import heapq
+
+from cnf import CNF
+from logic import Not
+
+# Resolvents a prover may generate before giving up
+LIMIT = 50000
+
+
+class ClauseStore():
+    """
+    Clauses, as frozensets of int literals, by id, with an index from
+    each literal to the ids of the clauses containing it.
+    """
+
+    def __init__(self):
+        self.clauses = dict()
+        self.index = dict()
+        self.next = 0
+
+    def add(self, clause):
+        self.next += 1
+        self.clauses[self.next] = clause
+        for literal in clause:
+            self.index.setdefault(literal, set()).add(self.next)
+        return self.next
+
+    def remove(self, id):
+        for literal in self.clauses.pop(id):
+            self.index[literal].discard(id)
+
+    def containing(self, literal):
+        """Returns the ids of clauses containing literal."""
+        return self.index.get(literal, set())
+
+    def subsumed(self, clause):
+        """Checks if a stored clause is a subset of clause."""
+        counts = dict()
+        for literal in clause:
+            for id in self.containing(literal):
+                counts[id] = counts.get(id, 0) + 1
+                if counts[id] == len(self.clauses[id]):
+                    return True
+        return False
+
+    def subsuming(self, clause):
+        """Returns the ids of stored clauses that are supersets of clause."""
+        candidates = sorted(
+            (self.containing(literal) for literal in clause), key=len
+        )
+        return set.intersection(*candidates)
+
+
+class Prover():
+    """
+    Given-clause resolution prover.
+
+    Supporting clauses wait in a queue, shortest first. Each step takes
+    the shortest as the given clause, moves it to the usable set, and
+    resolves it with every usable clause containing a complementary
+    literal. Usable clauses are never resolved with each other, so with
+    the negated query as support and the knowledge as usable, search
+    stays focused on the query. Tautologies and clauses subsumed by a
+    stored clause are dropped, and new clauses remove any stored clauses
+    they subsume.
+
+    Saturation can take exponentially many steps, so once more than limit
+    resolvents have been generated the prover gives up with an exception.
+    limit=None lets it run until it finishes.
+    """
+
+    def __init__(self, usable, support, limit=None):
+        self.store = ClauseStore()
+        self.usable = set()
+        self.queue = []
+        self.limit = limit
+        self.refuted = False
+
+        self.given = 0
+        self.generated = 0
+        self.kept = 0
+        self.tautologies = 0
+        self.forward_subsumed = 0
+        self.backward_subsumed = 0
+
+        for clause in usable:
+            self.add(frozenset(clause), supporting=False)
+        for clause in support:
+            self.add(frozenset(clause), supporting=True)
+
+    def add(self, clause, supporting=True):
+        """Stores a clause unless it is redundant, noting the empty one."""
+        if any(-literal in clause for literal in clause):
+            self.tautologies += 1
+            return
+        if not clause:
+            self.refuted = True
+            return
+        if self.store.subsumed(clause):
+            self.forward_subsumed += 1
+            return
+        for id in self.store.subsuming(clause):
+            self.store.remove(id)
+            self.usable.discard(id)
+            self.backward_subsumed += 1
+        id = self.store.add(clause)
+        self.kept += 1
+        if supporting:
+            heapq.heappush(self.queue, (len(clause), id))
+        else:
+            self.usable.add(id)
+
+    def refute(self):
+        """
+        Returns True if the empty clause is derived, or False once no
+        supporting clauses are left.
+        """
+        while self.queue and not self.refuted:
+            _, id = heapq.heappop(self.queue)
+            if id not in self.store.clauses:
+                continue
+            given = self.store.clauses[id]
+            self.usable.add(id)
+            self.given += 1
+            for literal in given:
+                for other in list(self.store.containing(-literal)):
+                    if other not in self.usable:
+                        continue
+                    resolvent = (
+                        given | self.store.clauses[other]
+                    ) - {literal, -literal}
+                    self.generated += 1
+                    if self.limit is not None and self.generated > self.limit:
+                        raise Exception(
+                            f"resolution gave up after {self.limit} "
+                            "resolvents; pass a larger limit"
+                        )
+                    self.add(resolvent)
+                    if self.refuted:
+                        return True
+                if id not in self.store.clauses:
+                    break
+        return self.refuted
+
+    def statistics(self):
+        """Returns the prover's counters by name."""
+        return {
+            "given": self.given,
+            "generated": self.generated,
+            "kept": self.kept,
+            "tautologies": self.tautologies,
+            "forward_subsumed": self.forward_subsumed,
+            "backward_subsumed": self.backward_subsumed
+        }
+
+
+def statistics(provers):
+    """Returns the sums of the provers' counters."""
+    totals = dict()
+    for prover in provers:
+        for name, value in prover.statistics().items():
+            totals[name] = totals.get(name, 0) + value
+    return totals
+
+
+def refutes(usable, support, limit, provers):
+    """
+    Checks if the empty clause can be derived from the usable and
+    supporting clauses, running a prover that is added to provers.
+    """
+    prover = Prover(usable, support, limit)
+    provers.append(prover)
+    return prover.refute()
+
+
+def entails(knowledge, query, limit=LIMIT, provers=None):
+    """
+    Checks if knowledge base entails query, by deriving the empty clause
+    from knowledge and ¬query with ¬query as the set of support.
+
+    That strategy only finds refutations that use the support, so when
+    it finds none, knowledge alone is checked for a refutation too.
+    Each prover run may generate up to limit resolvents, and is added to
+    provers if a list is given, for statistics. Saturation can need far
+    more resolvents than other engines need steps, so an exception is
+    raised if a run reaches limit; model_check passes both arguments on.
+    """
+    provers = [] if provers is None else provers
+    cnf = CNF()
+    cnf.add(knowledge)
+    size = len(cnf.clauses)
+    cnf.add(Not(query))
+    return (
+        refutes(cnf.clauses[:size], cnf.clauses[size:], limit, provers)
+        or refutes([], cnf.clauses[:size], limit, provers)
+    )
+
+
+def backbone(knowledge, queries, limit=LIMIT, provers=None):
+    """
+    Answers every query, checking knowledge for a refutation once and then
+    refuting ¬query and query in turn, each as the set of support. limit
+    and provers are as for entails.
+    """
+    provers = [] if provers is None else provers
+    cnf = CNF()
+    cnf.add(knowledge)
+    if refutes([], cnf.clauses, limit, provers):
+        return {query: True for query in queries}
+
+    answers = dict()
+    for query in queries:
+        literal = cnf.literal(query)
+        if refutes(cnf.clauses, [[-literal]], limit, provers):
+            answers[query] = True
+        elif refutes(cnf.clauses, [[literal]], limit, provers):
+            answers[query] = False
+        else:
+            answers[query] = None
+    return answers
@@ -0,0 +1,46 @@
+import unittest
+
+import graycode
+from logic import Symbol, Not, And, Or, Implication, model_check
+
+a = Symbol("a")
+b = Symbol("b")
+
+
+class TestConstants(unittest.TestCase):
+    """And() is true and Or() is false from the start of a search."""
+
+    def test_nested_true(self):
+        self.assertFalse(graycode.entails(And(And()), b))
+        self.assertTrue(graycode.entails(And(a, And()), a))
+
+    def test_nested_false(self):
+        self.assertFalse(graycode.entails(And(a), Or(b, Or())))
+        self.assertTrue(graycode.entails(And(a, Or()), b))
+        self.assertTrue(graycode.entails(And(a), Or(a, Or())))
+
+    def test_backbone(self):
+        self.assertEqual(
+            graycode.backbone(And(a, And()), [a, b]),
+            {a: True, b: None}
+        )
+        self.assertEqual(
+            graycode.backbone(And(Not(a), Implication(Or(), b)), [a, b]),
+            {a: False, b: None}
+        )
+
+    def test_agrees_with_model_check(self):
+        for knowledge, query in [
+            (And(And()), b),
+            (And(Or(a, Or())), a),
+            (And(Implication(And(), a)), a),
+            (And(Not(And(b, Or()))), b)
+        ]:
+            self.assertEqual(
+                graycode.entails(knowledge, query),
+                model_check(knowledge, query, engine="enumerate")
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
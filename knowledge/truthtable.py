@@ -0,0 +1,111 @@
+"""
+Truth-table model checking with NumPy bit vectors
+"""
+
+import numpy as np
+
+from logic import Symbol, Not, And, Or, Implication, Biconditional
+
+# Beyond this, a single vector takes more than 32 MiB
+MAX_SYMBOLS = 28
+
+# Bit patterns within one 64-model word of the first six symbols
+PATTERNS = [
+    0xAAAAAAAAAAAAAAAA,
+    0xCCCCCCCCCCCCCCCC,
+    0xF0F0F0F0F0F0F0F0,
+    0xFF00FF00FF00FF00,
+    0xFFFF0000FFFF0000,
+    0xFFFFFFFF00000000
+]
+ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+class TruthTable():
+    """
+    The whole truth table over a list of symbol names, one sentence at a
+    time.
+
+    Model m assigns the i-th name the value of bit i of m. A sentence is
+    evaluated to a vector of uint64 words whose bit m is its value in
+    model m, with each connective applied to whole vectors at once.
+    """
+
+    def __init__(self, names):
+        if len(names) > MAX_SYMBOLS:
+            raise Exception(f"too many symbols: {len(names)}")
+        self.indices = {name: i for i, name in enumerate(names)}
+        self.words = max(1, 2 ** len(names) // 64)
+        self.positions = np.arange(self.words, dtype=np.uint64)
+
+        # Fewer than 64 models leave unused high bits in the only word
+        self.valid = np.full(self.words, ONES)
+        if len(names) < 6:
+            self.valid[0] = (1 << 2 ** len(names)) - 1
+
+    def symbol(self, name):
+        """Returns the vector of a symbol's value in every model."""
+        i = self.indices[name]
+        if i < 6:
+            return np.full(self.words, np.uint64(PATTERNS[i]))
+        bits = (self.positions >> np.uint64(i - 6)) & np.uint64(1)
+        return np.where(bits == 1, ONES, np.uint64(0))
+
+    def vector(self, sentence):
+        """Returns the vector of a sentence's value in every model."""
+        if isinstance(sentence, Symbol):
+            return self.symbol(sentence.name)
+        elif isinstance(sentence, Not):
+            return np.invert(self.vector(sentence.operand))
+        elif isinstance(sentence, And):
+            result = np.full(self.words, ONES)
+            for conjunct in sentence.conjuncts:
+                result &= self.vector(conjunct)
+            return result
+        elif isinstance(sentence, Or):
+            result = np.zeros(self.words, dtype=np.uint64)
+            for disjunct in sentence.disjuncts:
+                result |= self.vector(disjunct)
+            return result
+        elif isinstance(sentence, Implication):
+            result = np.invert(self.vector(sentence.antecedent))
+            result |= self.vector(sentence.consequent)
+            return result
+        elif isinstance(sentence, Biconditional):
+            result = self.vector(sentence.left)
+            result ^= self.vector(sentence.right)
+            return np.invert(result, out=result)
+        raise Exception(f"cannot evaluate {sentence}")
+
+    def models(self, sentence):
+        """Returns the vector of models in which sentence is true."""
+        return self.vector(sentence) & self.valid
+
+
+def entails(knowledge, query):
+    """
+    Checks if knowledge base entails query, by finding no model where
+    knowledge is true and query is false.
+    """
+    table = TruthTable(sorted(set.union(knowledge.symbols(), query.symbols())))
+    counterexamples = table.models(knowledge)
+    counterexamples &= np.invert(table.vector(query))
+    return not counterexamples.any()
+
+
+def backbone(knowledge, queries):
+    """Answers every query against one vector of the knowledge's models."""
+    table = TruthTable(sorted(set.union(
+        knowledge.symbols(), *[query.symbols() for query in queries]
+    )))
+    models = table.models(knowledge)
+    answers = dict()
+    for query in queries:
+        vector = table.vector(query)
+        if not (models & np.invert(vector)).any():
+            answers[query] = True
+        elif not (models & vector).any():
+            answers[query] = False
+        else:
+            answers[query] = None
+    return answers
@@ -0,0 +1,2 @@
+# Run from search/, e.g. python -m degrees.degrees degrees/small, so that
+# the shared engine package is importable
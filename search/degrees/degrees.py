@@ -1,7 +1,8 @@
 import csv
+import os
 import sys
 
-from util import Node, StackFrontier, QueueFrontier
+from engine import Problem, solve
 
 # Maps names to a set of corresponding person_ids
 names = {}
@@ -54,8 +55,13 @@ def load_data(directory):
 
 def main():
     if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+        sys.exit("Usage: python -m degrees.degrees [directory]")
+    if len(sys.argv) == 2:
+        directory = sys.argv[1]
+    else:
+        directory = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "large"
+        )
 
     # Load data from files into memory
     print("Loading data...")
@@ -91,37 +97,26 @@ def shortest_path(source, target):
 
     If no possible path, returns None.
     """
-    # Initialize source node based on source person_id
-    sourceNode = Node(state=source, parent=None, action=None)
-    # Initialize frontier for BFS
-    frontier = QueueFrontier()
-    # Add source node to the frontier 
-    frontier.add(sourceNode)
-    # Initialize empty explored set
-    explored = set()
-    # Infinite loop
-    while True:
-        if frontier.empty():
-            return None
-        node = frontier.remove()
-        explored.add(node.state)
-        # Get neighbor nodes for current node
-        neighbors = neighbors_for_person(node.state)
-        for neighbor in neighbors:
-            # If the target person_id is a neighbor to the current node, then shortest path is found
-            if neighbor[1] == target:
-                # Initialize shortest path by appending target neighbor
-                shortestPath = [neighbor]
-                while node.parent is not None:
-                    shortestPath.append((node.action, node.state))
-                    node = node.parent
-                shortestPath.reverse()
-                return shortestPath
-            else:
-                for neighbor in neighbors:
-                    neighborNode = Node(state=neighbor[1], parent=node, action=neighbor[0])
-                    if not frontier.contains_state(neighborNode.state) and neighborNode.state not in explored:
-                        frontier.add(neighborNode)
+    solution = solve(Costars(source, target), "bidirectional")
+    if solution is None:
+        return None
+    return list(zip(solution.actions, solution.states))
+
+
+class Costars(Problem):
+    """Search problem over people linked by movies they starred in."""
+
+    def __init__(self, source, target):
+        self.start = source
+        self.goal = target
+
+    def neighbors(self, person_id):
+        return neighbors_for_person(person_id)
+
+    def predecessors(self, person_id):
+        # Starring together is symmetric, so edges work in both directions
+        return neighbors_for_person(person_id)
+
 
 def person_id_for_name(name):
     """
@@ -0,0 +1,10 @@
+from .problem import Problem, Solution, Parents
+from .strategies import (
+    STRATEGIES,
+    a_star,
+    bidirectional,
+    breadth_first,
+    depth_first,
+    iterative_deepening,
+    solve
+)
@@ -0,0 +1,82 @@
+class Problem():
+    """
+    Interface for a search problem.
+
+    Subclasses set start and implement neighbors. Set goal as well for the
+    default is_goal and for bidirectional search; heuristic (used by A*)
+    and predecessors (used by bidirectional search) have defaults.
+    """
+
+    start = None
+    goal = None
+
+    def neighbors(self, state):
+        """Returns (action, state) pairs reachable from state."""
+        raise NotImplementedError
+
+    def is_goal(self, state):
+        return state == self.goal
+
+    def heuristic(self, state):
+        """Estimates remaining steps to a goal, never overestimating."""
+        return 0
+
+    def predecessors(self, state):
+        """
+        Returns (action, state) pairs from which action leads to state.
+
+        The default inverts neighbors by searching one step back, which
+        only finds predecessors that are also neighbors. Problems with
+        one-way moves or a cheaper inverse should override it.
+        """
+        result = []
+        for _, other in self.neighbors(state):
+            for action, reached in self.neighbors(other):
+                if reached == state:
+                    result.append((action, other))
+        return result
+
+
+class Solution():
+    def __init__(self, actions, states, explored, num_explored):
+        self.actions = actions
+        self.states = states
+        self.explored = explored
+        self.num_explored = num_explored
+
+
+class Parents():
+    """
+    Search tree stored as parallel arrays instead of chains of nodes.
+
+    Each state is interned as an integer id; parents, actions and depths
+    are kept in lists indexed by that id.
+    """
+
+    def __init__(self, start):
+        self.ids = {start: 0}
+        self.states = [start]
+        self.parents = [-1]
+        self.actions = [None]
+        self.depths = [0]
+
+    def add(self, state, parent, action):
+        i = len(self.states)
+        self.ids[state] = i
+        self.states.append(state)
+        self.parents.append(parent)
+        self.actions.append(action)
+        self.depths.append(self.depths[parent] + 1)
+        return i
+
+    def path(self, i):
+        """Returns actions and states leading from the root to id i."""
+        actions = []
+        states = []
+        while self.parents[i] != -1:
+            actions.append(self.actions[i])
+            states.append(self.states[i])
+            i = self.parents[i]
+        actions.reverse()
+        states.reverse()
+        return actions, states
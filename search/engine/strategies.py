@@ -0,0 +1,206 @@
+import heapq
+from collections import deque
+
+from .problem import Parents, Solution
+
+
+def breadth_first(problem):
+    """Finds a shortest path by expanding states in order of depth."""
+    tree = Parents(problem.start)
+    frontier = deque([0])
+    explored = set()
+    while frontier:
+        i = frontier.popleft()
+        state = tree.states[i]
+        explored.add(state)
+        if problem.is_goal(state):
+            return Solution(*tree.path(i), explored, len(explored))
+        for action, neighbor in problem.neighbors(state):
+            if neighbor not in tree.ids:
+                frontier.append(tree.add(neighbor, i, action))
+    return None
+
+
+def depth_first(problem):
+    """Finds some path by always expanding the newest state."""
+    tree = Parents(problem.start)
+    frontier = [0]
+    explored = set()
+    while frontier:
+        i = frontier.pop()
+        state = tree.states[i]
+        explored.add(state)
+        if problem.is_goal(state):
+            return Solution(*tree.path(i), explored, len(explored))
+        for action, neighbor in problem.neighbors(state):
+            if neighbor not in tree.ids:
+                frontier.append(tree.add(neighbor, i, action))
+    return None
+
+
+def a_star(problem):
+    """Finds a shortest path guided by problem.heuristic."""
+    tree = Parents(problem.start)
+    costs = [0]
+    closed = [False]
+    frontier = [(problem.heuristic(problem.start), 0, 0)]
+    explored = set()
+    while frontier:
+        _, _, i = heapq.heappop(frontier)
+        if closed[i]:
+            continue
+        closed[i] = True
+        state = tree.states[i]
+        explored.add(state)
+        if problem.is_goal(state):
+            return Solution(*tree.path(i), explored, len(explored))
+        cost = costs[i] + 1
+        for action, neighbor in problem.neighbors(state):
+            j = tree.ids.get(neighbor)
+            if j is None:
+                j = tree.add(neighbor, i, action)
+                costs.append(cost)
+                closed.append(False)
+            elif closed[j] or cost >= costs[j]:
+                continue
+            else:
+                costs[j] = cost
+                tree.parents[j] = i
+                tree.actions[j] = action
+
+            # Break ties in favour of deeper states
+            heapq.heappush(
+                frontier, (cost + problem.heuristic(neighbor), -cost, j)
+            )
+    return None
+
+
+def iterative_deepening(problem):
+    """
+    Finds a shortest path with depth-limited searches of growing depth.
+
+    Memory is proportional to the depth of the current path plus the best
+    depth seen for each state, which prunes re-expansion within a pass.
+    """
+    start = problem.start
+    explored = {start}
+    num_explored = 1
+    if problem.is_goal(start):
+        return Solution([], [], explored, num_explored)
+
+    limit = 1
+    while True:
+        states = [start]
+        actions = [None]
+        neighbors = [iter(problem.neighbors(start))]
+        depths = {start: 0}
+        cutoff = False
+        while neighbors:
+            try:
+                action, state = next(neighbors[-1])
+            except StopIteration:
+                states.pop()
+                actions.pop()
+                neighbors.pop()
+                continue
+            depth = len(states)
+            if depths.get(state, depth + 1) <= depth:
+                continue
+            depths[state] = depth
+            explored.add(state)
+            num_explored += 1
+            if problem.is_goal(state):
+                return Solution(actions[1:] + [action], states[1:] + [state],
+                                explored, num_explored)
+            if depth == limit:
+                cutoff = True
+                continue
+            states.append(state)
+            actions.append(action)
+            neighbors.append(iter(problem.neighbors(state)))
+
+        # Stop once a pass explored everything without reaching the limit
+        if not cutoff:
+            return None
+        limit += 1
+
+
+def bidirectional(problem):
+    """
+    Finds a shortest path with breadth-first searches from both ends.
+
+    Requires problem.goal, and follows problem.predecessors backwards
+    from it. The smaller frontier is expanded one full layer at a time.
+    """
+    if problem.goal is None:
+        raise Exception("bidirectional search needs a goal state")
+    forward = Parents(problem.start)
+    backward = Parents(problem.goal)
+    explored = set()
+    if problem.start == problem.goal:
+        return Solution([], [], explored, 0)
+
+    forward_layer = [0]
+    backward_layer = [0]
+    num_explored = 0
+    while forward_layer and backward_layer:
+        if len(forward_layer) <= len(backward_layer):
+            tree, other, layer = forward, backward, forward_layer
+            expand = problem.neighbors
+        else:
+            tree, other, layer = backward, forward, backward_layer
+            expand = problem.predecessors
+
+        # Expand a whole layer, keeping the meeting state nearest the
+        # other end so the joined path is shortest
+        next_layer = []
+        meeting = None
+        for i in layer:
+            state = tree.states[i]
+            explored.add(state)
+            num_explored += 1
+            for action, neighbor in expand(state):
+                if neighbor in tree.ids:
+                    continue
+                next_layer.append(tree.add(neighbor, i, action))
+                j = other.ids.get(neighbor)
+                if j is not None and (
+                    meeting is None
+                    or other.depths[j] < other.depths[other.ids[meeting]]
+                ):
+                    meeting = neighbor
+
+        if meeting is not None:
+            actions, states = forward.path(forward.ids[meeting])
+            i = backward.ids[meeting]
+            while backward.parents[i] != -1:
+                actions.append(backward.actions[i])
+                i = backward.parents[i]
+                states.append(backward.states[i])
+            return Solution(actions, states, explored, num_explored)
+
+        if tree is forward:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+    return None
+
+
+STRATEGIES = {
+    "bfs": breadth_first,
+    "dfs": depth_first,
+    "astar": a_star,
+    "iddfs": iterative_deepening,
+    "bidirectional": bidirectional
+}
+
+
+def solve(problem, strategy="bfs"):
+    """
+    Searches problem with the named strategy.
+
+    Returns a Solution, or None if no goal state is reachable.
+    """
+    if strategy not in STRATEGIES:
+        raise Exception(f"unknown strategy {strategy}")
+    return STRATEGIES[strategy](problem)
@@ -1,41 +1,8 @@
 import sys
 
-class Node():
-    def __init__(self, state, parent, action):
-        self.state = state
-        self.parent = parent
-        self.action = action
+from engine import Problem, solve
 
-class StackFrontier():
-    def __init__(self):
-        self.frontier = []
-
-    def add(self, node):
-        self.frontier.append(node)
-
-    def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
-    
-    def isEmpty(self):
-        return len(self.frontier) == 0
-
-    def remove(self):
-        if self.isEmpty():
-            raise Exception('Empty frontier')
-        else:
-            node = self.frontier.pop()
-            return node
-
-class QueueFrontier(StackFrontier):
-
-    def remove(self):
-        if self.isEmpty():
-            raise Exception('Empty frontier')
-        else:
-            node = self.frontier.pop(0)
-            return node
-
-class Maze():
+class Maze(Problem):
     def __init__(self, filename):
         with open(filename) as f:
             contents = f.read()
@@ -47,7 +14,7 @@ class Maze():
 
         contents = contents.splitlines()
         self.height = len(contents)
-        self.width = max(len(line) for line in contents))
+        self.width = max(len(line) for line in contents)
 
         self.walls = []
         for i in range(self.height):
@@ -74,7 +41,7 @@ class Maze():
         for i, row in enumerate(self.walls):
             for j, col in enumerate(row):
                 if col:
-                    print(unichr(0x2588), end='')
+                    print('\u2588', end='')
                 elif (i, j) == self.start:
                     print('A', end='')
                 elif (i, j) == self.goal:
@@ -101,44 +68,15 @@ class Maze():
                 result.append((action, (i, j)))
         return result
 
+    def neighbors(self, state):
+        return self.neighbours(state)
+
     def solve(self):
         """Finds a solution to maze, if one exists."""
 
-        # Keep track of number of states explored
-        self.num_explored = 0
-
-        # Initialize the frontier to just the starting position
-        start = Node(state=self.start, parent=None, action=None)
-        frontier = StackFrontier()
-        frontier.add(start)
-
-        # Initialize an empty explored set
-        self.explored = set()
-
-        # Keep logging until solution is found
-        while True:
-            if frontier.isEmpty():
-                raise Exception('No solution')
-            currNode = frontier.remove()
-            self.explored += 1
-
-            if currNode.state = self.goal:
-                actions = []
-                cells = []
-                while currNode.parent is not None:
-                    actions.append(currNode.action)
-                    cells.append(currNode.state)
-                    currNode = currNode.parent
-                actions.reverse()
-                cells.reverse()
-                self.solution = (actions, cells)
-                return
-            
-            # Mark node as explored
-            self.explored.add(node.state)
-
-            # Add neighbours to the frontier
-            for action, state in self.neighbours(currNode):
-                if not frontier.contains_state(state) and state not in self.explored:
-                    neighbour = Node(state=state, parent=currNode, action=action)
-                    frontier.add(neighbour)
+        solution = solve(self, 'dfs')
+        if solution is None:
+            raise Exception('No solution')
+        self.num_explored = solution.num_explored
+        self.explored = solution.explored
+        self.solution = (solution.actions, solution.states)
@@ -0,0 +1,2 @@
+# Run from search/, e.g. python -m src.maze src/maze1.txt, so that the
+# shared engine package is importable
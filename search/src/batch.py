@@ -0,0 +1,74 @@
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from .maze import Maze, STRATEGIES
+
+
+def maze_files(path):
+    """Returns maze files in a directory, or those matching a glob."""
+    if os.path.isdir(path):
+        path = os.path.join(path, "*.txt")
+    return sorted(glob.glob(path))
+
+
+def solve_file(task):
+    """Solves one maze file and returns its summary."""
+    filename, strategy, images = task
+    summary = {"maze": filename, "strategy": strategy}
+    try:
+        maze = Maze(filename)
+        start = time.perf_counter()
+        maze.solve(strategy)
+        summary["time"] = time.perf_counter() - start
+        summary["explored"] = maze.num_explored
+        summary["length"] = len(maze.solution[1])
+        if images is not None:
+            name = os.path.splitext(os.path.basename(filename))[0]
+            maze.output_image(
+                os.path.join(images, f"{name}.png"), show_explored=True
+            )
+    except Exception as e:
+        summary["error"] = str(e)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Solve every maze in a directory or glob."
+    )
+    parser.add_argument("path", help="directory of .txt mazes, or a glob")
+    parser.add_argument("--strategy", default="bfs", choices=STRATEGIES)
+    parser.add_argument("--output", default="-",
+                        help="JSON lines results file (default: stdout)")
+    parser.add_argument("--images", default=None,
+                        help="directory to write one image per maze")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="number of solver processes")
+    args = parser.parse_args()
+
+    filenames = maze_files(args.path)
+    if not filenames:
+        sys.exit(f"no mazes found at {args.path}")
+    if args.images is not None:
+        os.makedirs(args.images, exist_ok=True)
+
+    tasks = [(filename, args.strategy, args.images) for filename in filenames]
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    failed = 0
+    with multiprocessing.Pool(args.workers) as pool:
+        for summary in pool.imap_unordered(solve_file, tasks, chunksize=4):
+            failed += "error" in summary
+            output.write(json.dumps(summary) + "\n")
+    if output is not sys.stdout:
+        output.close()
+    print(f"Solved {len(tasks) - failed} of {len(tasks)} mazes.",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from .generate import generate_suite
+from .maze import Maze, STRATEGIES
+
+
+def measure(filename, strategy, repeat=3):
+    """Solves a maze file with strategy and returns its measurements."""
+
+    # Time the search without tracing allocations
+    maze = Maze(filename)
+    if strategy == "hpa":
+        start = time.perf_counter()
+        maze.preprocess()
+        preprocess = time.perf_counter() - start
+    else:
+        preprocess = 0.0
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        maze.solve(strategy)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    # Solve again on a fresh maze to record peak memory
+    traced = Maze(filename)
+    if strategy == "hpa":
+        traced.abstraction = maze.abstraction
+    tracemalloc.start()
+    traced.solve(strategy)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "time": elapsed,
+        "preprocess": preprocess,
+        "explored": maze.num_explored,
+        "memory": peak,
+        "length": len(maze.solution[1])
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Prints results next to baseline and returns number of regressions."""
+    regressions = 0
+    print(f"{'maze':<24}{'strategy':<15}{'time (s)':>12}{'explored':>10}"
+          f"{'memory (KB)':>13}{'length':>8}  vs baseline")
+    for key in sorted(results):
+        name, strategy = key.split(":")
+        result = results[key]
+        notes = []
+        if key in baseline:
+            old = baseline[key]
+            ratio = result["time"] / old["time"] if old["time"] else 1.0
+            notes.append(f"time x{ratio:.2f}")
+            if ratio > 1 + tolerance:
+                notes.append("SLOWER")
+                regressions += 1
+            for field in ["explored", "length"]:
+                if result[field] != old[field]:
+                    notes.append(f"{field} {old[field]} -> {result[field]}")
+            if result["memory"] > old["memory"] * (1 + tolerance):
+                notes.append("MORE MEMORY")
+                regressions += 1
+        else:
+            notes.append("new")
+        print(f"{name:<24}{strategy:<15}{result['time']:>12.4f}"
+              f"{result['explored']:>10}{result['memory'] / 1024:>13.1f}"
+              f"{result['length']:>8}  {', '.join(notes)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark every maze solving strategy."
+    )
+    here = os.path.dirname(os.path.abspath(__file__))
+    parser.add_argument("--suite", default=os.path.join(here, "suite"),
+                        help="directory of mazes, generated if missing")
+    parser.add_argument("--baseline",
+                        default=os.path.join(here, "baseline.json"),
+                        help="stored results to compare against")
+    parser.add_argument("--save", action="store_true",
+                        help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed fractional slowdown before flagging")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="solves per maze, keeping the fastest time")
+    # Iterative deepening re-walks the maze once per depth, so it is opt-in
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES,
+                        default=[s for s in STRATEGIES if s != "iddfs"])
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.suite):
+        print(f"Generating suite in {args.suite}...")
+        generate_suite(args.suite)
+    filenames = sorted(glob.glob(os.path.join(args.suite, "*.txt")))
+
+    results = dict()
+    for filename in filenames:
+        for strategy in args.strategies:
+            name = os.path.splitext(os.path.basename(filename))[0]
+            results[f"{name}:{strategy}"] = measure(
+                filename, strategy, args.repeat
+            )
+
+    baseline = dict()
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=4)
+        print(f"Saved baseline to {args.baseline}")
+    elif regressions:
+        sys.exit(f"{regressions} regression(s) against baseline")
+
+
+if __name__ == "__main__":
+    main()
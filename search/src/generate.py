@@ -0,0 +1,107 @@
+import os
+import random
+import sys
+
+# Default benchmark suite: maze sizes and loop densities
+SIZES = [21, 41, 81, 161]
+DENSITIES = [0.0, 0.5, 1.0]
+
+
+def generate(height, width, density=0.0, seed=None):
+    """
+    Generates a maze as a list of lines in the maze.txt format.
+
+    Passages are carved with a randomized depth-first search, giving a
+    perfect maze (exactly one path between any two cells). Density is the
+    fraction of dead ends then opened into loops: 0 keeps the maze perfect,
+    1 braids it fully. Start is placed top left and goal bottom right.
+    """
+    if height < 3 or width < 3:
+        raise Exception("maze must be at least 3x3")
+    rng = random.Random(seed)
+
+    # Cells sit at odd coordinates, separated by walls
+    rows, cols = (height - 1) // 2, (width - 1) // 2
+    grid = [[True] * width for _ in range(height)]
+
+    def open_neighbors(cell, carved):
+        i, j = cell
+        result = []
+        for di, dj in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            if 0 <= i + di < rows and 0 <= j + dj < cols:
+                if carved(i + di, j + dj):
+                    result.append((i + di, j + dj))
+        return result
+
+    def carve(a, b):
+        grid[2 * a[0] + 1][2 * a[1] + 1] = False
+        grid[2 * b[0] + 1][2 * b[1] + 1] = False
+        grid[a[0] + b[0] + 1][a[1] + b[1] + 1] = False
+
+    # Carve a spanning tree with an explicit stack
+    visited = {(0, 0)}
+    stack = [(0, 0)]
+    grid[1][1] = False
+    while stack:
+        cell = stack[-1]
+        candidates = open_neighbors(
+            cell, lambda i, j: (i, j) not in visited
+        )
+        if not candidates:
+            stack.pop()
+            continue
+        neighbor = rng.choice(candidates)
+        carve(cell, neighbor)
+        visited.add(neighbor)
+        stack.append(neighbor)
+
+    # Braid by opening a wall out of some dead ends
+    def passages(cell):
+        i, j = cell
+        return [
+            n for n in open_neighbors(cell, lambda i, j: True)
+            if not grid[i + n[0] + 1][j + n[1] + 1]
+        ]
+
+    for i in range(rows):
+        for j in range(cols):
+            if len(passages((i, j))) == 1 and rng.random() < density:
+                walled = [
+                    n for n in open_neighbors((i, j), lambda i, j: True)
+                    if n not in passages((i, j))
+                ]
+                if walled:
+                    carve((i, j), rng.choice(walled))
+
+    lines = [["#" if wall else " " for wall in row] for row in grid]
+    lines[1][1] = "A"
+    lines[2 * rows - 1][2 * cols - 1] = "B"
+    return ["".join(line) for line in lines]
+
+
+def generate_suite(directory, sizes=SIZES, densities=DENSITIES, seed=0):
+    """Writes one maze per size and density into directory."""
+    os.makedirs(directory, exist_ok=True)
+    filenames = []
+    for size in sizes:
+        for density in densities:
+            kind = "perfect" if density == 0 else f"braided{int(density * 100)}"
+            filename = os.path.join(directory, f"{kind}-{size}x{size}.txt")
+            with open(filename, "w") as f:
+                f.write("\n".join(generate(size, size, density, seed)) + "\n")
+            filenames.append(filename)
+    return filenames
+
+
+def main():
+    if len(sys.argv) not in [3, 4, 5]:
+        sys.exit("Usage: python generate.py height width [density] [seed]")
+    height, width = int(sys.argv[1]), int(sys.argv[2])
+    density = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    for line in generate(height, width, density, seed):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
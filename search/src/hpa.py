@@ -0,0 +1,253 @@
+import hashlib
+import heapq
+import json
+from collections import deque
+
+MOVES = [
+    ("up", (-1, 0)),
+    ("down", (1, 0)),
+    ("left", (0, -1)),
+    ("right", (0, 1))
+]
+
+# Entrances at least this wide get a transition at each end instead of one
+# in the middle
+WIDE_ENTRANCE = 6
+
+
+def fingerprint(walls, cluster_size):
+    """Returns a digest identifying a wall layout and cluster size."""
+    digest = hashlib.sha1(f"{cluster_size}:{len(walls)}:".encode())
+    for row in walls:
+        digest.update(bytes(row))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class Abstraction():
+    """
+    Hierarchical (HPA*) abstraction of a grid maze.
+
+    The grid is split into square clusters. Cells on either side of an
+    open stretch of cluster border become entrance nodes, and every pair
+    of entrances within a cluster is connected by its in-cluster distance.
+    Queries search this small graph and then refine each abstract edge
+    into cells, so paths are near-optimal rather than guaranteed shortest.
+    """
+
+    def __init__(self, height, width, cluster_size, edges, fingerprint):
+        self.height = height
+        self.width = width
+        self.cluster_size = cluster_size
+        self.edges = edges
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, walls, cluster_size=10):
+        """Precomputes entrances and intra-cluster distances for walls."""
+        height = len(walls)
+        width = len(walls[0]) if height else 0
+        abstraction = cls(height, width, cluster_size, dict(),
+                          fingerprint(walls, cluster_size))
+
+        # Find entrances along every border between adjacent clusters
+        for ci in range(0, height, cluster_size):
+            for cj in range(0, width, cluster_size):
+                bottom = ci + cluster_size
+                right = cj + cluster_size
+                if right < width:
+                    abstraction.add_entrances(walls, [
+                        ((i, right - 1), (i, right))
+                        for i in range(ci, min(bottom, height))
+                    ])
+                if bottom < height:
+                    abstraction.add_entrances(walls, [
+                        ((bottom - 1, j), (bottom, j))
+                        for j in range(cj, min(right, width))
+                    ])
+
+        # Connect entrances that share a cluster
+        clusters = dict()
+        for node in abstraction.edges:
+            clusters.setdefault(abstraction.cluster(node), []).append(node)
+        for nodes in clusters.values():
+            for node in nodes:
+                distances = abstraction.distances(walls, node)
+                for other in nodes:
+                    if other != node and other in distances:
+                        abstraction.edges[node][other] = distances[other]
+        return abstraction
+
+    def add_entrances(self, walls, pairs):
+        """Adds transitions for each open run of cell pairs along a border."""
+        run = []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and not walls[a[0]][a[1]] and not walls[b[0]][b[1]]:
+                run.append((a, b))
+                continue
+            if len(run) >= WIDE_ENTRANCE:
+                transitions = [run[0], run[-1]]
+            elif run:
+                transitions = [run[len(run) // 2]]
+            else:
+                transitions = []
+            for a_cell, b_cell in transitions:
+                self.edges.setdefault(a_cell, dict())[b_cell] = 1
+                self.edges.setdefault(b_cell, dict())[a_cell] = 1
+            run = []
+
+    def cluster(self, cell):
+        return (cell[0] // self.cluster_size, cell[1] // self.cluster_size)
+
+    def bounds(self, cell):
+        """Returns (top, left, bottom, right) of the cluster holding cell."""
+        ci, cj = self.cluster(cell)
+        top, left = ci * self.cluster_size, cj * self.cluster_size
+        return (top, left,
+                min(top + self.cluster_size, self.height),
+                min(left + self.cluster_size, self.width))
+
+    def explore(self, walls, source, target=None, explored=None):
+        """
+        Breadth-first search from source without leaving its cluster.
+
+        Returns a dict mapping each reached cell to (distance, parent).
+        Stops early once target is reached, if one is given.
+        """
+        top, left, bottom, right = self.bounds(source)
+        reached = {source: (0, None)}
+        queue = deque([source])
+        while queue:
+            cell = queue.popleft()
+            if explored is not None:
+                explored.add(cell)
+            if cell == target:
+                break
+            distance = reached[cell][0] + 1
+            for _, (di, dj) in MOVES:
+                i, j = cell[0] + di, cell[1] + dj
+                if (top <= i < bottom and left <= j < right
+                        and not walls[i][j] and (i, j) not in reached):
+                    reached[(i, j)] = (distance, cell)
+                    queue.append((i, j))
+        return reached
+
+    def distances(self, walls, source, explored=None):
+        return {
+            cell: distance
+            for cell, (distance, _) in self.explore(
+                walls, source, explored=explored
+            ).items()
+        }
+
+    def entrances(self, distances):
+        """Returns edges to the entrance nodes among distances."""
+        return {
+            node: distance
+            for node, distance in distances.items()
+            if distance and node in self.edges
+        }
+
+    def search(self, walls, start, goal):
+        """
+        Finds a path from start to goal.
+
+        Returns (actions, cells, explored) in the form used by Maze, with
+        start excluded from cells, or None if there is no path.
+        """
+        explored = set()
+
+        # Temporarily insert start and goal into the abstract graph
+        distances = self.distances(walls, start, explored)
+        extra = {start: self.entrances(distances)}
+        if goal in distances:
+            extra[start][goal] = distances[goal]
+        for node, cost in self.entrances(
+            self.distances(walls, goal, explored)
+        ).items():
+            extra.setdefault(node, dict())[goal] = cost
+
+        def neighbors(node):
+            yield from self.edges.get(node, dict()).items()
+            yield from extra.get(node, dict()).items()
+
+        # A* over the abstract graph
+        costs = {start: 0}
+        parents = {start: None}
+        frontier = [(manhattan(start, goal), 0, start)]
+        while frontier:
+            _, cost, node = heapq.heappop(frontier)
+            if node == goal:
+                break
+            if cost > costs[node]:
+                continue
+            for neighbor, step in neighbors(node):
+                if cost + step < costs.get(neighbor, float("inf")):
+                    costs[neighbor] = cost + step
+                    parents[neighbor] = node
+                    heapq.heappush(frontier, (
+                        cost + step + manhattan(neighbor, goal),
+                        cost + step,
+                        neighbor
+                    ))
+        else:
+            return None
+
+        # Recover the abstract path
+        waypoints = [goal]
+        while parents[waypoints[-1]] is not None:
+            waypoints.append(parents[waypoints[-1]])
+        waypoints.reverse()
+
+        # Refine each abstract edge into cells
+        cells = []
+        for a, b in zip(waypoints, waypoints[1:]):
+            if self.cluster(a) == self.cluster(b):
+                reached = self.explore(walls, a, target=b, explored=explored)
+                segment = []
+                cell = b
+                while cell != a:
+                    segment.append(cell)
+                    cell = reached[cell][1]
+                segment.reverse()
+                cells.extend(segment)
+            else:
+                cells.append(b)
+        actions = []
+        previous = start
+        for cell in cells:
+            delta = (cell[0] - previous[0], cell[1] - previous[1])
+            actions.append(next(a for a, d in MOVES if d == delta))
+            previous = cell
+        return actions, cells, explored
+
+    def save(self, filename):
+        """Writes the abstraction to a JSON file."""
+        data = {
+            "height": self.height,
+            "width": self.width,
+            "cluster_size": self.cluster_size,
+            "fingerprint": self.fingerprint,
+            "edges": [
+                [a[0], a[1], b[0], b[1], cost]
+                for a in self.edges
+                for b, cost in self.edges[a].items()
+            ]
+        }
+        with open(filename, "w") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, filename):
+        """Reads an abstraction written by save."""
+        with open(filename) as f:
+            data = json.load(f)
+        edges = dict()
+        for ai, aj, bi, bj, cost in data["edges"]:
+            edges.setdefault((ai, aj), dict())[(bi, bj)] = cost
+        return cls(data["height"], data["width"], data["cluster_size"],
+                   edges, data["fingerprint"])
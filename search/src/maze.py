@@ -1,45 +1,17 @@
+import os
 import sys
 
-class Node():
-    def __init__(self, state, parent, action):
-        self.state = state
-        self.parent = parent
-        self.action = action
+from engine import Problem, solve, STRATEGIES as ENGINE_STRATEGIES
+from .hpa import Abstraction, fingerprint
 
 
-class StackFrontier():
-    def __init__(self):
-        self.frontier = []
+# Ways Maze.solve can search: the engine's strategies, plus hierarchical
+STRATEGIES = list(ENGINE_STRATEGIES) + ["hpa"]
 
-    def add(self, node):
-        self.frontier.append(node)
+OPPOSITE = {"up": "down", "down": "up", "left": "right", "right": "left"}
 
-    def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
 
-    def empty(self):
-        return len(self.frontier) == 0
-
-    def remove(self):
-        if self.empty():
-            raise Exception("empty frontier")
-        else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
-            return node
-
-
-class QueueFrontier(StackFrontier):
-
-    def remove(self):
-        if self.empty():
-            raise Exception("empty frontier")
-        else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
-            return node
-
-class Maze():
+class Maze(Problem):
 
     def __init__(self, filename):
 
@@ -79,6 +51,7 @@ class Maze():
             self.walls.append(row)
 
         self.solution = None
+        self.abstraction = None
 
 
     def print(self):
@@ -116,52 +89,64 @@ class Maze():
         return result
 
 
-    def solve(self):
-        """Finds a solution to maze, if one exists."""
-
-        # Keep track of number of states explored
-        self.num_explored = 0
+    def predecessors(self, state):
+        return [
+            (OPPOSITE[action], cell)
+            for action, cell in self.neighbors(state)
+        ]
 
-        # Initialize frontier to just the starting position
-        start = Node(state=self.start, parent=None, action=None)
-        frontier = QueueFrontier()
-        frontier.add(start)
 
-        # Initialize an empty explored set
-        self.explored = set()
+    def heuristic(self, state):
+        return abs(state[0] - self.goal[0]) + abs(state[1] - self.goal[1])
 
-        # Keep looping until solution found
-        while True:
 
-            # If nothing left in frontier, then no path
-            if frontier.empty():
-                raise Exception("no solution")
+    def preprocess(self, cluster_size=10, filename=None):
+        """
+        Enables hierarchical (HPA*) solving for large mazes.
 
-            # Choose a node from the frontier
-            node = frontier.remove()
-            self.num_explored += 1
-
-            # If node is the goal, then we have a solution
-            if node.state == self.goal:
-                actions = []
-                cells = []
-                while node.parent is not None:
-                    actions.append(node.action)
-                    cells.append(node.state)
-                    node = node.parent
-                actions.reverse()
-                cells.reverse()
-                self.solution = (actions, cells)
+        If filename names an abstraction saved for this same maze and
+        cluster size, it is reused; otherwise one is built and saved there.
+        """
+        if filename is not None and os.path.exists(filename):
+            abstraction = Abstraction.load(filename)
+            if abstraction.fingerprint == fingerprint(self.walls, cluster_size):
+                self.abstraction = abstraction
                 return
+        self.abstraction = Abstraction.build(self.walls, cluster_size)
+        if filename is not None:
+            self.abstraction.save(filename)
+
+
+    def solve(self, strategy=None):
+        """
+        Finds a solution to maze, if one exists.
+
+        Strategy is one of STRATEGIES. By default, mazes that have been
+        preprocessed are solved hierarchically and others breadth-first.
+        """
+        if strategy is None:
+            strategy = "bfs" if self.abstraction is None else "hpa"
+        if strategy not in STRATEGIES:
+            raise Exception(f"unknown strategy {strategy}")
+
+        # Answer on the abstract graph
+        if strategy == "hpa":
+            if self.abstraction is None:
+                self.preprocess()
+            solution = self.abstraction.search(self.walls, self.start, self.goal)
+            if solution is None:
+                raise Exception("no solution")
+            actions, cells, self.explored = solution
+            self.num_explored = len(self.explored)
+            self.solution = (actions, cells)
+            return
 
-            # Mark node as explored
-            self.explored.add(node.state)
-
-            # Add neighbors to frontier
-            for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action)
-                    frontier.add(child)
+        solution = solve(self, strategy)
+        if solution is None:
+            raise Exception("no solution")
+        self.num_explored = solution.num_explored
+        self.explored = solution.explored
+        self.solution = (solution.actions, solution.states)
 
 
     def output_image(self, filename, show_solution=True, show_explored=False):
@@ -215,15 +200,26 @@ class Maze():
         img.save(filename)
 
 
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
-
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
+def main():
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python -m src.maze maze.txt [abstraction.json]")
+
+    m = Maze(sys.argv[1])
+    if len(sys.argv) == 3:
+        print("Preprocessing...")
+        m.preprocess(filename=sys.argv[2])
+    print("Maze:")
+    m.print()
+    print("Solving...")
+    m.solve()
+    print("States Explored:", m.num_explored)
+    print("Solution:")
+    m.print()
+    m.output_image(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "maze.png"),
+        show_explored=True
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Monte Carlo Tree Search player
+"""
+
+import math
+import random
+import time
+
+import tictactoe as ttt
+
+# Exploration weight in the UCT formula
+EXPLORATION = math.sqrt(2)
+
+
+class Node():
+    """
+    A position in the search tree.
+
+    Wins count playouts won by the player who moved into this position,
+    with draws counting half.
+    """
+
+    def __init__(self, game, board, parent=None, action=None):
+        self.board = board
+        self.key = game.to_bitboard(board)
+        self.parent = parent
+        self.action = action
+        self.player = game.player(board)
+        self.terminal = game.terminal(board)
+        self.utility = game.utility(board) if self.terminal else None
+        self.children = []
+        self.untried = [] if self.terminal else list(game.actions(board))
+        random.shuffle(self.untried)
+        self.visits = 0
+        self.wins = 0.0
+
+    def select(self):
+        """Returns the child with the highest upper confidence bound."""
+        logVisits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda child: (
+                child.wins / child.visits +
+                EXPLORATION * math.sqrt(logVisits / child.visits)
+            )
+        )
+
+
+class MCTS():
+    """
+    Anytime UCT player for tictactoe.py or an mnk.Game.
+
+    The tree is built with the game's player, actions, result, terminal
+    and utility functions, while random playouts run on its (xs, os_bits)
+    bitboards. The tree is kept between moves, so time spent on the
+    position that actually arises is not lost.
+    """
+
+    def __init__(self, game=ttt):
+        self.game = game
+        board = game.initial_state()
+        self.cols = len(board[0])
+        self.size = len(board) * self.cols
+        self.root = None
+
+    def best_move(self, board, iterations=None, budget=None):
+        """
+        Returns the most visited action from board after running the given
+        number of iterations or for budget seconds, whichever ends first.
+        Defaults to 1000 iterations if neither is given.
+        """
+        if iterations is None and budget is None:
+            iterations = 1000
+        self.root = self.reuse(board) or Node(self.game, board)
+        if self.root.terminal:
+            return None
+
+        deadline = None if budget is None else time.perf_counter() + budget
+        done = 0
+        while (iterations is None or done < iterations) and (
+            deadline is None or time.perf_counter() < deadline
+        ):
+            self.iterate()
+            done += 1
+
+        return max(self.root.children, key=lambda child: child.visits).action
+
+    def reuse(self, board):
+        """
+        Returns the node for board among the root and its descendants two
+        plies deep, detached from the old tree, or None if absent.
+        """
+        if self.root is None:
+            return None
+        key = self.game.to_bitboard(board)
+        nodes = [self.root]
+        for _ in range(3):
+            for node in nodes:
+                if node.key == key:
+                    node.parent = None
+                    return node
+            nodes = [child for node in nodes for child in node.children]
+        return None
+
+    def iterate(self):
+        """Runs one selection, expansion, playout and backpropagation."""
+
+        # Select down through fully expanded nodes
+        node = self.root
+        while not node.untried and node.children:
+            node = node.select()
+
+        # Expand one untried action
+        if node.untried:
+            action = node.untried.pop()
+            child = Node(self.game, self.game.result(node.board, action),
+                         parent=node, action=action)
+            node.children.append(child)
+            node = child
+
+        # Play out at random and credit every node on the path
+        outcome = self.playout(node)
+        while node is not None:
+            node.visits += 1
+            if node.parent is not None:
+                mover = node.parent.player
+                if outcome == 0:
+                    node.wins += 0.5
+                elif (outcome == 1) == (mover == ttt.X):
+                    node.wins += 1
+            node = node.parent
+
+    def playout(self, node):
+        """
+        Plays random moves from node to the end of the game on bitboards.
+        Returns 1 if X wins, -1 if O wins, 0 otherwise.
+        """
+        if node.terminal:
+            return node.utility
+        xs, os_bits = node.key
+        occupied = xs | os_bits
+        empty = [b for b in range(self.size) if not occupied & (1 << b)]
+        random.shuffle(empty)
+        xToMove = node.player == ttt.X
+        for b in empty:
+            if xToMove:
+                if self.game.completes_line(xs, b):
+                    return 1
+                xs |= 1 << b
+            else:
+                if self.game.completes_line(os_bits, b):
+                    return -1
+                os_bits |= 1 << b
+            xToMove = not xToMove
+        return 0
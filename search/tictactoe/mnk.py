@@ -0,0 +1,318 @@
+"""
+Generalized m,n,k-game player
+"""
+
+import time
+
+from tictactoe import X, O, EMPTY
+
+# Score of a won position, less the plies taken so quicker wins rank higher
+WIN = 10 ** 9
+
+# How often, in nodes searched, to check the clock
+CLOCK_INTERVAL = 128
+
+
+class Timeout(Exception):
+    """Raised inside a search when its time budget runs out."""
+
+
+class Game():
+    """
+    An m,n,k-game: two players alternate placing marks on a rows by cols
+    board, and the first to get k in a row, column or diagonal wins.
+    Game(3, 3, 3) is tic-tac-toe and Game(15, 15, 5) is gomoku.
+
+    Boards use the same list-of-lists format as tictactoe.py. Internally
+    each player's marks are an int with bit i * cols + j set for (i, j).
+    """
+
+    def __init__(self, rows=3, cols=3, k=3):
+        if k > max(rows, cols):
+            raise Exception("k must fit on the board")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.cells = [(i, j) for i in range(rows) for j in range(cols)]
+        self.full = (1 << (rows * cols)) - 1
+
+        # Bit mask of every line of k cells, and of the lines through
+        # each cell
+        self.masks = []
+        for i, j in self.cells:
+            for di, dj in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                end = (i + (k - 1) * di, j + (k - 1) * dj)
+                if 0 <= end[0] < rows and 0 <= end[1] < cols:
+                    self.masks.append(sum(
+                        self.bit((i + n * di, j + n * dj)) for n in range(k)
+                    ))
+        self.cell_masks = [
+            [mask for mask in self.masks if mask & (1 << b)]
+            for b in range(rows * cols)
+        ]
+
+        # Cells within two steps of each cell, where moves are considered
+        self.nearby = [
+            sum(
+                self.bit((i + di, j + dj))
+                for di in range(-2, 3) for dj in range(-2, 3)
+                if 0 <= i + di < rows and 0 <= j + dj < cols
+            )
+            for i, j in self.cells
+        ]
+
+        # Quiet moves are tried from the center outwards
+        center = ((rows - 1) / 2, (cols - 1) / 2)
+        self.order = sorted(
+            range(rows * cols),
+            key=lambda b: (abs(self.cells[b][0] - center[0]) +
+                           abs(self.cells[b][1] - center[1]))
+        )
+
+        # Line scores for the heuristic, by number of marks in the line
+        self.line_scores = [0] + [10 ** n for n in range(1, k)]
+
+        # (depth, value, bound, move) keyed by (mine, theirs)
+        self.transpositions = dict()
+
+    def bit(self, cell):
+        return 1 << (cell[0] * self.cols + cell[1])
+
+    def initial_state(self):
+        return [[EMPTY] * self.cols for _ in range(self.rows)]
+
+    def to_bitboard(self, board):
+        """Returns the (xs, os_bits) bitboard of a board."""
+        xs = os_bits = 0
+        for cell in self.cells:
+            if board[cell[0]][cell[1]] == X:
+                xs |= self.bit(cell)
+            elif board[cell[0]][cell[1]] == O:
+                os_bits |= self.bit(cell)
+        return xs, os_bits
+
+    def from_bitboard(self, xs, os_bits):
+        """Returns the board of an (xs, os_bits) bitboard."""
+        board = self.initial_state()
+        for cell in self.cells:
+            if xs & self.bit(cell):
+                board[cell[0]][cell[1]] = X
+            elif os_bits & self.bit(cell):
+                board[cell[0]][cell[1]] = O
+        return board
+
+    def wins(self, bits):
+        for mask in self.masks:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def completes_line(self, bits, b):
+        """Returns True if adding cell bit b to bits makes k in a row."""
+        bits |= 1 << b
+        for mask in self.cell_masks[b]:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def player(self, board):
+        xs, os_bits = self.to_bitboard(board)
+        return X if bin(xs).count("1") == bin(os_bits).count("1") else O
+
+    def actions(self, board):
+        return {
+            (i, j) for i, j in self.cells if board[i][j] is EMPTY
+        }
+
+    def result(self, board, action):
+        i, j = action
+        if not (0 <= i < self.rows and 0 <= j < self.cols) or (
+            board[i][j] is not EMPTY
+        ):
+            raise Exception("not possible to make action")
+        boardCopy = [row[:] for row in board]
+        boardCopy[i][j] = self.player(board)
+        return boardCopy
+
+    def winner(self, board):
+        xs, os_bits = self.to_bitboard(board)
+        if self.wins(xs):
+            return X
+        elif self.wins(os_bits):
+            return O
+        else:
+            return None
+
+    def terminal(self, board):
+        xs, os_bits = self.to_bitboard(board)
+        return self.wins(xs) or self.wins(os_bits) or xs | os_bits == self.full
+
+    def utility(self, board):
+        possibleWinner = self.winner(board)
+        if possibleWinner == X:
+            return 1
+        elif possibleWinner == O:
+            return -1
+        return 0
+
+    def evaluate(self, mine, theirs):
+        """
+        Scores a position for the player to move by counting lines that
+        only one player can still complete, weighted by their marks.
+        """
+        score = 0
+        occupied = mine | theirs
+        for mask in self.masks:
+            if not mask & occupied:
+                continue
+            if not mask & theirs:
+                score += self.line_scores[bin(mask & mine).count("1")]
+            elif not mask & mine:
+                score -= self.line_scores[bin(mask & theirs).count("1")]
+        return score
+
+    def moves(self, mine, theirs, first=None):
+        """
+        Returns candidate cell bits for the player to move: first, then
+        winning moves, then blocks, then empty cells near existing marks.
+        """
+        occupied = mine | theirs
+        if not occupied:
+            return [self.order[0]]
+        nearby = 0
+        for b in range(self.rows * self.cols):
+            if occupied & (1 << b):
+                nearby |= self.nearby[b]
+        candidates = nearby & ~occupied
+        winning = []
+        blocking = []
+        quiet = []
+        for b in self.order:
+            if not candidates & (1 << b) or b == first:
+                continue
+            if self.completes_line(mine, b):
+                winning.append(b)
+            elif self.completes_line(theirs, b):
+                blocking.append(b)
+            else:
+                quiet.append(b)
+        if first is not None:
+            winning.insert(0, first)
+        return winning + blocking + quiet
+
+    def from_position(self, value, ply):
+        """
+        Returns a value found ply plies below the root counted from its own
+        position instead: win and loss scores count plies from the root,
+        so the table stores them this way to stay valid in later searches.
+        A negative ply converts a stored value back.
+        """
+        if value >= WIN - self.rows * self.cols - 1:
+            return value + ply
+        if value <= -(WIN - self.rows * self.cols - 1):
+            return value - ply
+        return value
+
+    def negamax(self, mine, theirs, depth, alpha, beta, ply):
+        """
+        Returns the value of a position for the player to move, searching
+        depth plies with alpha-beta pruning.
+        """
+        self.nodes += 1
+        if self.nodes % CLOCK_INTERVAL == 0 and (
+            time.perf_counter() > self.deadline
+        ):
+            raise Timeout
+        if mine | theirs == self.full:
+            return 0
+        if depth == 0:
+            return self.evaluate(mine, theirs)
+
+        key = (mine, theirs)
+        entry = self.transpositions.get(key)
+        first = None
+        if entry is not None:
+            entryDepth, value, bound, first = entry
+            value = self.from_position(value, -ply)
+            if entryDepth >= depth:
+                if bound == "exact":
+                    return value
+                elif bound == "lower":
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        originalAlpha = alpha
+        best = -WIN * 2
+        bestMove = None
+        for b in self.moves(mine, theirs, first):
+            if self.completes_line(mine, b):
+                best, bestMove = WIN - ply - 1, b
+                break
+            value = -self.negamax(
+                theirs, mine | 1 << b, depth - 1, -beta, -alpha, ply + 1
+            )
+            if value > best:
+                best, bestMove = value, b
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best <= originalAlpha:
+            bound = "upper"
+        elif best >= beta:
+            bound = "lower"
+        else:
+            bound = "exact"
+        self.transpositions[key] = (
+            depth, self.from_position(best, ply), bound, bestMove
+        )
+        return best
+
+    def best_move(self, board, budget=1.0, max_depth=None):
+        """
+        Returns the best action found for the player to move, searching
+        one ply deeper at a time until budget seconds have passed or the
+        game is solved. The move from the deepest finished search is
+        kept, improved by any better move of an unfinished one.
+        """
+        if self.terminal(board):
+            return None
+        xs, os_bits = self.to_bitboard(board)
+        if self.player(board) == X:
+            mine, theirs = xs, os_bits
+        else:
+            mine, theirs = os_bits, xs
+        self.deadline = time.perf_counter() + budget
+        self.nodes = 0
+        remaining = bin(self.full & ~(xs | os_bits)).count("1")
+        if max_depth is None or max_depth > remaining:
+            max_depth = remaining
+
+        moves = self.moves(mine, theirs)
+        best = moves[0]
+        for depth in range(1, max_depth + 1):
+            alpha, beta = -WIN * 2, WIN * 2
+            depthBest = None
+            try:
+                for b in moves:
+                    if self.completes_line(mine, b):
+                        return self.cells[b]
+                    value = -self.negamax(
+                        theirs, mine | 1 << b, depth - 1, -beta, -alpha, 1
+                    )
+                    if value > alpha:
+                        alpha, depthBest = value, b
+                        if b != moves[0]:
+                            best = b
+            except Timeout:
+                break
+            best = depthBest if depthBest is not None else best
+
+            # Stop once a forced result has been found
+            if abs(alpha) >= WIN - self.rows * self.cols - 1:
+                break
+            moves = [best] + [b for b in moves if b != best]
+        return self.cells[best]
@@ -0,0 +1,150 @@
+"""
+Parallel root-split search for m,n,k-games
+"""
+
+import multiprocessing
+import time
+
+from mnk import Game, Timeout, WIN
+from tictactoe import X
+
+# Per worker process: the best root value found so far at the current
+# depth, shared by all workers, and games kept so their tables persist
+shared_alpha = None
+games = dict()
+
+
+def init_worker(alpha):
+    global shared_alpha
+    shared_alpha = alpha
+
+
+def search_move(task):
+    """
+    Scores one root move, using just below the best value other workers
+    have already proven as the lower bound of its search window, so that
+    a move tying that value is still scored exactly.
+
+    Returns (move, value, exact), with value None if the deadline passed
+    first. exact is whether value beat the bound; a value no greater than
+    the bound is only an upper bound, showing the move is worse.
+    """
+    rows, cols, k, mine, theirs, b, depth, deadline = task
+    if (rows, cols, k) not in games:
+        games[(rows, cols, k)] = Game(rows, cols, k)
+    game = games[(rows, cols, k)]
+
+    # Deadlines cross processes as wall-clock times
+    if time.time() >= deadline:
+        return b, None, False
+    game.deadline = time.perf_counter() + deadline - time.time()
+    game.nodes = 0
+    bound = shared_alpha.value - 1
+    if game.completes_line(mine, b):
+        value = WIN - 1
+    else:
+        try:
+            value = -game.negamax(
+                theirs, mine | 1 << b, depth - 1, -WIN * 2, -bound, 1
+            )
+        except Timeout:
+            return b, None, False
+    with shared_alpha.get_lock():
+        if value > shared_alpha.value:
+            shared_alpha.value = value
+    return b, value, value > bound
+
+
+class ParallelSearch():
+    """
+    Searches m,n,k-game positions by sending each root move to a pool of
+    worker processes, one iterative deepening step at a time.
+    """
+
+    def __init__(self, rows=3, cols=3, k=3, workers=None):
+        self.game = Game(rows, cols, k)
+        self.alpha = multiprocessing.Value("d", -WIN * 2)
+        self.pool = multiprocessing.Pool(
+            workers, initializer=init_worker, initargs=(self.alpha,)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+
+    def best_move(self, board, budget=1.0, max_depth=None):
+        """
+        Returns the best action found for the player to move within budget
+        seconds, like Game.best_move but with root moves searched in
+        parallel.
+        """
+        game = self.game
+        if game.terminal(board):
+            return None
+        xs, os_bits = game.to_bitboard(board)
+        if game.player(board) == X:
+            mine, theirs = xs, os_bits
+        else:
+            mine, theirs = os_bits, xs
+        deadline = time.time() + budget
+        remaining = bin(game.full & ~(xs | os_bits)).count("1")
+        if max_depth is None or max_depth > remaining:
+            max_depth = remaining
+
+        moves = game.moves(mine, theirs)
+        for b in moves:
+            if game.completes_line(mine, b):
+                return game.cells[b]
+        best = moves[0]
+        for depth in range(1, max_depth + 1):
+            self.alpha.value = -WIN * 2
+            tasks = [
+                (game.rows, game.cols, game.k,
+                 mine, theirs, b, depth, deadline)
+                for b in moves
+            ]
+            values = dict()
+            exact = dict()
+            for b, value, isExact in self.pool.imap(search_move, tasks):
+                values[b] = value
+                exact[b] = isExact
+
+            # Only exact values are compared, since a bound depends on
+            # what other workers had proven when the search began. The
+            # best exact value is the best of the depth, and ties go to
+            # the move ordered first, so timing cannot change the choice
+            finished = [b for b in moves if values[b] is not None]
+            scored = [b for b in finished if exact[b]]
+            if not scored:
+                break
+            depthBest = max(scored, key=lambda b: values[b])
+
+            # Keep an unfinished depth's move only if it beat the previous
+            # best, which was searched first: exactly, or by the previous
+            # best failing to reach a value another move had proven
+            if len(finished) == len(moves) or (
+                values[moves[0]] is not None and (
+                    not exact[moves[0]]
+                    or values[depthBest] > values[moves[0]]
+                )
+            ):
+                best = depthBest
+            if len(finished) < len(moves):
+                break
+
+            # Stop once a forced result has been found
+            if abs(values[best]) >= WIN - game.rows * game.cols - 1:
+                break
+            # Order the next depth by exact value, with moves known only to
+            # be worse kept in their previous order after them
+            moves = [best] + sorted(
+                (b for b in moves if b != best),
+                key=lambda b: -values[b] if exact[b] else WIN * 2
+            )
+        return game.cells[best]
@@ -1,6 +1,7 @@
 import pygame
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import tictactoe as ttt
 
@@ -17,9 +18,19 @@ mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
 moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
 
+clock = pygame.time.Clock()
+
+# AI moves are searched on a worker thread so the window keeps drawing;
+# ai_move is the pending search's future, and its move is played no
+# sooner than AI_DELAY seconds after ai_started. A search cannot be
+# interrupted, so quitting waits for one still running to finish
+AI_DELAY = 0.5
+executor = ThreadPoolExecutor(max_workers=1)
+ai_move = None
+ai_started = None
+
 user = None
 board = ttt.initial_state()
-ai_turn = False
 
 while True:
 
@@ -110,13 +121,12 @@ while True:
 
         # Check for AI move
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
+            if ai_move is None:
+                ai_move = executor.submit(ttt.minimax, board)
+                ai_started = time.time()
+            elif ai_move.done() and time.time() - ai_started >= AI_DELAY:
+                board = ttt.result(board, ai_move.result())
+                ai_move = None
 
         # Check for a user move
         click, _, _ = pygame.mouse.get_pressed()
@@ -141,6 +151,6 @@ while True:
                     time.sleep(0.2)
                     user = None
                     board = ttt.initial_state()
-                    ai_turn = False
 
     pygame.display.flip()
+    clock.tick(60)
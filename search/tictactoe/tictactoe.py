@@ -3,12 +3,85 @@ Tic Tac Toe Player
 """
 
 import math
-import copy
+import os
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# Internally a board is a pair of 9-bit ints (xs, os_bits), one per player,
+# with bit 3 * i + j set when that player holds cell (i, j). Making a move
+# is an OR with the cell's bit, and undoing it an XOR.
+CELLS = [(i, j) for i in range(3) for j in range(3)]
+FULL = (1 << 9) - 1
+
+# Every row, column and diagonal, as lists of cells
+LINES = (
+    [[(i, j) for j in range(3)] for i in range(3)] +
+    [[(i, j) for i in range(3)] for j in range(3)] +
+    [[(i, i) for i in range(3)], [(i, 2 - i) for i in range(3)]]
+)
+
+# Bit mask of each line, and of the lines through each cell
+WIN_MASKS = [sum(1 << (3 * i + j) for i, j in line) for line in LINES]
+CELL_MASKS = [
+    [mask for mask in WIN_MASKS if mask & (1 << k)] for k in range(9)
+]
+
+# Preference among quiet moves: center, then corners, then edges
+PLACEMENT = {
+    (i, j): 0 if (i, j) == (1, 1) else 1 if i != 1 and j != 1 else 2
+    for i in range(3) for j in range(3)
+}
+MOVE_ORDER = sorted(range(9), key=lambda k: PLACEMENT[CELLS[k]])
+
+# Rotations and reflections of the board, each as the cell (i, j) that
+# ends up at every position when read row by row
+SYMMETRIES = [
+    [transform(i, j) for i in range(3) for j in range(3)]
+    for transform in [
+        lambda i, j: (i, j),
+        lambda i, j: (j, 2 - i),
+        lambda i, j: (2 - i, 2 - j),
+        lambda i, j: (2 - j, i),
+        lambda i, j: (i, 2 - j),
+        lambda i, j: (2 - i, j),
+        lambda i, j: (j, i),
+        lambda i, j: (2 - j, 2 - i)
+    ]
+]
+
+# For each symmetry, the image of every possible 9-bit player mask
+SYMMETRY_TABLES = [
+    [
+        sum(1 << k for k, (i, j) in enumerate(symmetry)
+            if bits & (1 << (3 * i + j)))
+        for bits in range(1 << 9)
+    ]
+    for symmetry in SYMMETRIES
+]
+
+# Base-3 index of each 9-bit mask, so a position's index in the perfect
+# play table is TERNARY[xs] + 2 * TERNARY[os_bits]
+TERNARY = [
+    sum(3 ** k for k in range(9) if bits & (1 << k))
+    for bits in range(1 << 9)
+]
+
+# Perfect play table: one byte per base-3 position index holding
+# 3 * move + value + 1, where move 9 means no move, or UNREACHABLE
+TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "perfect_play.bin")
+TABLE_SIZE = 3 ** 9
+UNREACHABLE = 255
+table = None
+
+# Whether a stored value is exact or only a lower or upper bound
+EXACT, LOWER, UPPER = "exact", "lower", "upper"
+
+# (value, bound) of positions already searched, keyed by canonical_key
+transpositions = dict()
+
 
 def initial_state():
     """
@@ -19,105 +92,91 @@ def initial_state():
             [EMPTY, EMPTY, EMPTY]]
 
 
+def to_bitboard(board):
+    """
+    Returns the (xs, os_bits) bitboard of a board.
+    """
+    xs = os_bits = 0
+    for k, (i, j) in enumerate(CELLS):
+        if board[i][j] == X:
+            xs |= 1 << k
+        elif board[i][j] == O:
+            os_bits |= 1 << k
+    return xs, os_bits
+
+
+def from_bitboard(xs, os_bits):
+    """
+    Returns the board of an (xs, os_bits) bitboard.
+    """
+    board = initial_state()
+    for k, (i, j) in enumerate(CELLS):
+        if xs & (1 << k):
+            board[i][j] = X
+        elif os_bits & (1 << k):
+            board[i][j] = O
+    return board
+
+
+def wins(bits):
+    """
+    Returns True if a player's bits contain a complete line.
+    """
+    for mask in WIN_MASKS:
+        if bits & mask == mask:
+            return True
+    return False
+
+
 def player(board):
     """
     Returns player who has the next turn on a board.
     """
-    xMoves = count_moves_in_board(board, X)
-    oMoves = count_moves_in_board(board, O)
-    if xMoves == oMoves:
-        return X
-    else:
-        return O
+    xs, os_bits = to_bitboard(board)
+    return X if bin(xs).count("1") == bin(os_bits).count("1") else O
 
-def count_moves_in_board(board, move):
-    count = 0
-    for row in board:
-        for col in row:
-            if col == move:
-                count += 1
-    return count
 
 def actions(board):
     """
     Returns set of all possible actions (i, j) available on the board.
     """
-    possibleActions = set()
-    for i, row in enumerate(board):
-        for j, col in enumerate(row):
-            if col is EMPTY:
-                possibleActions.add((i, j))
-    return possibleActions
+    xs, os_bits = to_bitboard(board)
+    empty = FULL & ~(xs | os_bits)
+    return {CELLS[k] for k in range(9) if empty & (1 << k)}
+
 
 def result(board, action):
     """
     Returns the board that results from making move (i, j) on the board.
     """
-    boardCopy = copy.deepcopy(board)
-    currPlayer = player(boardCopy)
-    possibleActions = actions(boardCopy)
-    if action in possibleActions:
-        boardCopy[action[0]][action[1]] = currPlayer
-    else:
+    i, j = action
+    if not (0 <= i < 3 and 0 <= j < 3) or board[i][j] is not EMPTY:
         raise Exception('not possible to make action')
+    boardCopy = [row[:] for row in board]
+    boardCopy[i][j] = player(board)
     return boardCopy
 
+
 def winner(board):
     """
     Returns the winner of the game, if there is one.
     """
-    rowWinner = check_for_winner_on_rows(board)
-    diagonalWinner = check_for_winner_on_diagonals(board)
-    columnWinner = check_for_winner_on_columns(board)
-
-    if rowWinner:
-        return rowWinner
-    elif diagonalWinner:
-        return diagonalWinner
-    elif columnWinner:
-        return columnWinner
+    xs, os_bits = to_bitboard(board)
+    if wins(xs):
+        return X
+    elif wins(os_bits):
+        return O
     else:
         return None
 
-def check_for_winner_on_rows(board):
-    winner = None
-    for row in board:
-        if all(el == row[0] for el in row):
-            winner = row[0]
-            break
-    return winner
-
-def check_for_winner_on_diagonals(board):
-    winner = None
-    leftDiagonal = [board[0][0], board[1][1], board[2][2]]
-    rightDiagonal = [board[0][2], board[1][1], board[2][0]]
-    if all(el == leftDiagonal[0] for el in leftDiagonal):
-        winner = leftDiagonal[0]
-    elif all(el == rightDiagonal[0] for el in rightDiagonal):
-        winner = rightDiagonal[0]
-    return winner
-            
-def check_for_winner_on_columns(board):
-    winner = None
-    leftColumn = [board[0][0], board[1][0], board[2][0]]
-    middleColumn = [board[0][1], board[1][1], board[2][1]]
-    rightColumn = [board[0][2], board[1][2], board[2][2]]
-    if all(el == leftColumn[0] for el in leftColumn):
-        winner = leftColumn[0]
-    elif all(el == middleColumn[0] for el in middleColumn):
-        winner = middleColumn[0]
-    elif all(el == rightColumn[0] for el in rightColumn):
-        winner = rightColumn[0]
-    return winner
 
 def terminal(board):
     """
     Returns True if game is over, False otherwise.
     """
-    isTerminal = False
-    if winner(board) or (EMPTY not in board[0] and EMPTY not in board[1] and EMPTY not in board[2]):
-        isTerminal = True
-    return isTerminal
+    xs, os_bits = to_bitboard(board)
+    return wins(xs) or wins(os_bits) or xs | os_bits == FULL
+
 
 def utility(board):
     """
@@ -138,40 +197,216 @@ def minimax(board):
     """
     Returns the optimal action for the current player on the board.
     """
-    if terminal(board):
-        return None
-    currPlayer = player(board)
-    possibleActions = actions(board)
-    if currPlayer == X:
-        u = float("-inf")
-        for possibleAction in possibleActions:
-            possibleActionUtility = min_value(result(board, possibleAction))
-            if possibleActionUtility > u:
-                u = possibleActionUtility
-                actionToTake = possibleAction
+    return evaluate([board])[0][0]
+
+
+def evaluate(boards):
+    """
+    Returns an (optimal action, value) pair for each board, looked up in
+    the perfect play table. Action is None on terminal boards.
+    """
+    entries = perfect_play()
+    results = []
+    for board in boards:
+        xs, os_bits = to_bitboard(board)
+        entry = entries[TERNARY[xs] + 2 * TERNARY[os_bits]]
+
+        # Boards that cannot arise in play are searched instead
+        if entry == UNREACHABLE:
+            move, value = solve(xs, os_bits)
+        else:
+            move, value = entry // 3, entry % 3 - 1
+        results.append((CELLS[move] if move < 9 else None, value))
+    return results
+
+
+def perfect_play():
+    """
+    Returns the perfect play table, loading it from TABLE_FILE or building
+    and saving it on first use.
+    """
+    global table
+    if table is None:
+        try:
+            with open(TABLE_FILE, "rb") as f:
+                table = f.read()
+        except OSError:
+            table = b""
+        if len(table) != TABLE_SIZE:
+            table = build_table()
+            try:
+                with open(TABLE_FILE, "wb") as f:
+                    f.write(table)
+            except OSError:
+                pass
+    return table
+
+
+def build_table():
+    """
+    Solves every position reachable from the empty board.
+    """
+    entries = bytearray([UNREACHABLE]) * TABLE_SIZE
+    frontier = [(0, 0)]
+    while frontier:
+        xs, os_bits = frontier.pop()
+        index = TERNARY[xs] + 2 * TERNARY[os_bits]
+        if entries[index] != UNREACHABLE:
+            continue
+        move, value = solve(xs, os_bits)
+        entries[index] = 3 * move + value + 1
+        if move < 9:
+            empty = FULL & ~(xs | os_bits)
+            xToMove = bin(xs).count("1") == bin(os_bits).count("1")
+            for k in range(9):
+                if empty & (1 << k):
+                    if xToMove:
+                        frontier.append((xs | 1 << k, os_bits))
+                    else:
+                        frontier.append((xs, os_bits | 1 << k))
+    return bytes(entries)
+
+
+def solve(xs, os_bits):
+    """
+    Returns (best move, exact value) for a bitboard, with move 9 on
+    terminal positions.
+    """
+    if wins(xs):
+        return 9, 1
+    if wins(os_bits):
+        return 9, -1
+    if xs | os_bits == FULL:
+        return 9, 0
+
+    # A full-window search returns exact values
+    best = None
+    if bin(xs).count("1") == bin(os_bits).count("1"):
+        for k in ordered_moves(xs, os_bits):
+            u = min_value(xs | 1 << k, os_bits)
+            if best is None or u > best[1]:
+                best = (k, u)
     else:
-        u = float("inf")
-        for possibleAction in possibleActions:
-            possibleActionUtility = max_value(result(board, possibleAction))
-            if possibleActionUtility < u:
-                u = possibleActionUtility
-                actionToTake = possibleAction
-    return actionToTake
-
-def max_value(board):
-    if terminal(board):
-        return utility(board)
-    possibleActions = actions(board)
-    u = float("-inf")
-    for possibleAction in possibleActions:
-        u = max(u, min_value(result(board, possibleAction)))
+        for k in ordered_moves(os_bits, xs):
+            u = max_value(xs, os_bits | 1 << k)
+            if best is None or u < best[1]:
+                best = (k, u)
+    return best
+
+
+def ordered_moves(mine, theirs):
+    """
+    Returns the empty cells' bit indices with the likeliest best moves
+    first: winning moves, then blocking moves, then the center, corners
+    and edges.
+    """
+    empty = FULL & ~(mine | theirs)
+    winning = []
+    blocking = []
+    quiet = []
+    for k in MOVE_ORDER:
+        if not empty & (1 << k):
+            continue
+        if completes_line(mine, k):
+            winning.append(k)
+        elif completes_line(theirs, k):
+            blocking.append(k)
+        else:
+            quiet.append(k)
+    return winning + blocking + quiet
+
+
+def completes_line(bits, k):
+    """
+    Returns True if adding cell k to bits would make three in a row.
+    """
+    bits |= 1 << k
+    for mask in CELL_MASKS[k]:
+        if bits & mask == mask:
+            return True
+    return False
+
+
+def canonical_key(xs, os_bits):
+    """
+    Returns a key shared by a bitboard and all its rotations and
+    reflections.
+    """
+    return min(sym[xs] << 9 | sym[os_bits] for sym in SYMMETRY_TABLES)
+
+
+def lookup(xs, os_bits, alpha, beta):
+    """
+    Returns (key, value, alpha, beta) for a bitboard from the
+    transposition table. Value is None unless the stored entry settles
+    the search; otherwise alpha and beta are narrowed by any stored bound.
+    """
+    key = canonical_key(xs, os_bits)
+    if key in transpositions:
+        value, bound = transpositions[key]
+        if bound == EXACT:
+            return key, value, alpha, beta
+        elif bound == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return key, value, alpha, beta
+    return key, None, alpha, beta
+
+
+def store(key, u, alpha, beta):
+    """
+    Records u for key, noting whether it is exact or only a bound
+    because the search window (alpha, beta) cut it off.
+    """
+    if u <= alpha:
+        transpositions[key] = (u, UPPER)
+    elif u >= beta:
+        transpositions[key] = (u, LOWER)
+    else:
+        transpositions[key] = (u, EXACT)
+
+
+def max_value(xs, os_bits, alpha=-1, beta=1):
+    """
+    Returns the value of a bitboard with X to move.
+    """
+    if wins(os_bits):
+        return -1
+    if xs | os_bits == FULL:
+        return 0
+    key, u, alpha, beta = lookup(xs, os_bits, alpha, beta)
+    if u is not None:
+        return u
+    originalAlpha = alpha
+    u = -math.inf
+    for k in ordered_moves(xs, os_bits):
+        u = max(u, min_value(xs | 1 << k, os_bits, alpha, beta))
+        alpha = max(alpha, u)
+        if u >= beta:
+            break
+    store(key, u, originalAlpha, beta)
     return u
 
-def min_value(board):
-    if terminal(board):
-        return utility(board)
-    possibleActions = actions(board)
-    u = float("inf")
-    for possibleAction in possibleActions:
-        u = min(u, max_value(result(board, possibleAction)))
+
+def min_value(xs, os_bits, alpha=-1, beta=1):
+    """
+    Returns the value of a bitboard with O to move.
+    """
+    if wins(xs):
+        return 1
+    if xs | os_bits == FULL:
+        return 0
+    key, u, alpha, beta = lookup(xs, os_bits, alpha, beta)
+    if u is not None:
+        return u
+    originalBeta = beta
+    u = math.inf
+    for k in ordered_moves(os_bits, xs):
+        u = min(u, max_value(xs, os_bits | 1 << k, alpha, beta))
+        beta = min(beta, u)
+        if u <= alpha:
+            break
+    store(key, u, alpha, originalBeta)
     return u